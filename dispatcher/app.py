@@ -1,8 +1,12 @@
 """FastAPI application and route definitions."""
 
+import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import Depends, FastAPI, Request, HTTPException
 from fastapi.responses import PlainTextResponse
 
 from . import registry
@@ -11,7 +15,12 @@ from . import pods
 from .handlers import git as git_handler
 from .handlers import gh as gh_handler
 from .bootstrap import bootstrap_workspace, BootstrapError
-from .models import GitRequest, GhRequest, PodCreateRequest, PodInfo, PodListResponse, PodCreateResponse
+from .config import BOOTSTRAP_CONCURRENCY
+from .models import (
+    GitRequest, GhRequest,
+    HealthResponse, RegistrationResponse, DeregistrationResponse, RegistryResponse, BootstrapResponse,
+    PodCreateRequest, PodInfo, PodListResponse, PodCreateResponse, PodDeleteResponse,
+)
 from .paths import translate_cwd, InvalidPathError
 
 
@@ -23,6 +32,13 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="yolo-cage Git Dispatcher", version="0.2.0")
 
+_bootstrap_executor = ThreadPoolExecutor(max_workers=BOOTSTRAP_CONCURRENCY, thread_name_prefix="bootstrap")
+
+# A misconfigured pod retries in a tight loop. Its rejections are still
+# decided by the registry on every request, but logged at most this often.
+_UNREGISTERED_LOG_INTERVAL = 2.0
+_unregistered_logged_at: dict[str, float] = {}
+
 
 def handle_pod_operation(operation_name: str, func, *args, **kwargs):
     """Execute a pod operation with consistent error handling.
@@ -34,18 +50,61 @@ def handle_pod_operation(operation_name: str, func, *args, **kwargs):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"{operation_name}: {e}")
+        logger.error("%s: %s", operation_name, e)
         raise HTTPException(500, str(e))
 
 
-@app.get("/health")
+def reject_unregistered(client_ip: str, operation: str) -> HTTPException:
+    """Build the 403 for an unregistered pod, logging it at most once per interval."""
+    now = time.monotonic()
+    last_logged = _unregistered_logged_at.get(client_ip)
+    if last_logged is None or now - last_logged >= _UNREGISTERED_LOG_INTERVAL:
+        # Expired entries no longer suppress anything. Dropping them keeps the
+        # table to the pods rejected within the last interval.
+        for ip, logged_at in list(_unregistered_logged_at.items()):
+            if now - logged_at >= _UNREGISTERED_LOG_INTERVAL:
+                del _unregistered_logged_at[ip]
+        _unregistered_logged_at[client_ip] = now
+        logger.warning("Unregistered pod %s attempted %s operation", client_ip, operation)
+    return HTTPException(403, "yolo-cage: pod not registered. Contact cluster admin.")
+
+
+class PodContext(NamedTuple):
+    """The registered pod making a request."""
+    client_ip: str
+    branch: str
+
+
+async def pod_context(request: Request) -> PodContext:
+    """Resolve the calling pod's assigned branch, rejecting unregistered pods."""
+    client_ip = request.client.host
+    if registry.shared:
+        # A shared registry may query SQLite, which can wait on another worker's write.
+        branch = await asyncio.to_thread(registry.get_branch, client_ip)
+    else:
+        branch = registry.get_branch(client_ip)
+    if branch is None:
+        raise reject_unregistered(client_ip, request.url.path.lstrip("/"))
+    return PodContext(client_ip, branch)
+
+
+def workspace_cwd(agent_cwd: str, pod: PodContext) -> str:
+    """Translate the pod's working directory into its workspace, rejecting escapes."""
+    try:
+        return translate_cwd(agent_cwd, pod.branch)
+    except InvalidPathError as e:
+        logger.warning("Invalid path from %s: %s", pod.client_ip, e)
+        raise HTTPException(400, f"yolo-cage: {e}")
+
+
+@app.get("/health", response_model=HealthResponse)
 async def health():
     """Health check endpoint."""
     return {"status": "ok"}
 
 
-@app.post("/register")
-async def register_pod(request: Request, branch: str):
+@app.post("/register", response_model=RegistrationResponse)
+def register_pod(request: Request, branch: str):
     """Register a pod IP -> branch mapping. Rejects re-registration attempts."""
     client_ip = request.client.host
     try:
@@ -55,8 +114,8 @@ async def register_pod(request: Request, branch: str):
     return {"status": "registered", "ip": client_ip, "branch": branch}
 
 
-@app.delete("/register")
-async def deregister_pod(request: Request):
+@app.delete("/register", response_model=DeregistrationResponse)
+def deregister_pod(request: Request):
     """Remove a pod from the registry."""
     client_ip = request.client.host
     branch = registry.deregister(client_ip)
@@ -65,89 +124,66 @@ async def deregister_pod(request: Request):
     return {"status": "not_found", "ip": client_ip}
 
 
-@app.get("/registry")
-async def list_registry():
+@app.get("/registry", response_model=RegistryResponse)
+def list_registry():
     """List all registered pods."""
     return {"registry": registry.list_all()}
 
 
-@app.post("/bootstrap")
-async def bootstrap(branch: str):
+@app.post("/bootstrap", response_model=BootstrapResponse)
+async def bootstrap(branch: str, refresh: bool = False):
     """
     Bootstrap a workspace for a branch.
 
     Called during pod init to clone the repository and check out the branch.
-    Runs with dispatcher privileges (has PAT, can clone).
+    Runs with dispatcher privileges (has PAT, can clone). Use ?refresh=true
+    to fetch a workspace that is already on its branch.
     """
-    logger.info(f"Bootstrap requested for branch: {branch}")
+    logger.info("Bootstrap requested for branch: %s", branch)
     try:
-        result = bootstrap_workspace(branch)
-        logger.info(f"Bootstrap complete: {result}")
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(_bootstrap_executor, bootstrap_workspace, branch, refresh)
+        logger.info("Bootstrap complete: %s", result)
         return result
     except BootstrapError as e:
-        logger.error(f"Bootstrap failed: {e}")
+        logger.error("Bootstrap failed: %s", e)
         raise HTTPException(500, str(e))
 
 
 @app.post("/git", response_class=PlainTextResponse)
-async def handle_git(git_req: GitRequest, request: Request):
+async def handle_git(git_req: GitRequest, pod: PodContext = Depends(pod_context)):
     """Handle a git command from a sandbox pod."""
-    client_ip = request.client.host
-    assigned_branch = registry.get_branch(client_ip)
-
-    if assigned_branch is None:
-        logger.warning(f"Unregistered pod {client_ip} attempted git operation")
-        raise HTTPException(403, "yolo-cage: pod not registered. Contact cluster admin.")
-
-    try:
-        cwd = translate_cwd(git_req.cwd, assigned_branch)
-    except InvalidPathError as e:
-        logger.warning(f"Invalid path from {client_ip}: {e}")
-        raise HTTPException(400, f"yolo-cage: {e}")
-
-    logger.info(f"Git from {client_ip} ({assigned_branch}): {git_req.args}")
-
-    return git_handler.handle(git_req.args, cwd, assigned_branch)
+    cwd = workspace_cwd(git_req.cwd, pod)
+    logger.info("Git from %s (%s): %s", pod.client_ip, pod.branch, git_req.args)
+    return await git_handler.handle(git_req.args, cwd, pod.branch)
 
 
 @app.post("/gh", response_class=PlainTextResponse)
-async def handle_gh(gh_req: GhRequest, request: Request):
+async def handle_gh(gh_req: GhRequest, pod: PodContext = Depends(pod_context)):
     """Handle a gh CLI command from a sandbox pod."""
-    client_ip = request.client.host
-    assigned_branch = registry.get_branch(client_ip)
-
-    if assigned_branch is None:
-        logger.warning(f"Unregistered pod {client_ip} attempted gh operation")
-        raise HTTPException(403, "yolo-cage: pod not registered. Contact cluster admin.")
-
-    try:
-        cwd = translate_cwd(gh_req.cwd, assigned_branch)
-    except InvalidPathError as e:
-        logger.warning(f"Invalid path from {client_ip}: {e}")
-        raise HTTPException(400, f"yolo-cage: {e}")
-
-    logger.info(f"gh from {client_ip} ({assigned_branch}): {gh_req.args}")
-
-    return gh_handler.handle(gh_req.args, cwd)
+    cwd = workspace_cwd(gh_req.cwd, pod)
+    logger.info("gh from %s (%s): %s", pod.client_ip, pod.branch, gh_req.args)
+    return await gh_handler.handle(gh_req.args, cwd)
 
 
-# Pod lifecycle management endpoints
+# Pod lifecycle management endpoints. They block on the Kubernetes API, so
+# they are plain `def` and FastAPI runs them in its threadpool.
 @app.post("/pods", response_model=PodCreateResponse)
-async def create_pod(req: PodCreateRequest):
+def create_pod(req: PodCreateRequest):
     """Create a new pod for a branch."""
-    logger.info(f"Create pod requested for branch: {req.branch}")
+    logger.info("Create pod requested for branch: %s", req.branch)
     return handle_pod_operation("Failed to create pod", pods.create_pod, req.branch)
 
 
 @app.get("/pods", response_model=PodListResponse)
-async def list_pods():
+def list_pods():
     """List all yolo-cage pods."""
     pod_list = handle_pod_operation("Failed to list pods", pods.list_pods)
     return PodListResponse(pods=pod_list)
 
 
 @app.get("/pods/{branch}", response_model=PodInfo)
-async def get_pod(branch: str):
+def get_pod(branch: str):
     """Get status of a specific pod."""
     def get_or_404():
         pod = pods.get_pod(branch)
@@ -157,10 +193,10 @@ async def get_pod(branch: str):
     return handle_pod_operation("Failed to get pod", get_or_404)
 
 
-@app.delete("/pods/{branch}")
-async def delete_pod(branch: str, clean: bool = False):
+@app.delete("/pods/{branch}", response_model=PodDeleteResponse)
+def delete_pod(branch: str, clean: bool = False):
     """Delete a pod. Use ?clean=true to also delete the workspace."""
-    logger.info(f"Delete pod requested for branch: {branch} (clean={clean})")
+    logger.info("Delete pod requested for branch: %s (clean=%s)", branch, clean)
     def delete_or_404():
         if not pods.delete_pod(branch, clean_workspace=clean):
             raise HTTPException(404, f"Pod for branch '{branch}' not found")
@@ -4,8 +4,13 @@ This module orchestrates initial workspace setup. It detects the workspace
 state and delegates to the appropriate module for handling.
 """
 
+import contextlib
+import fcntl
+import hashlib
 import logging
+import os
 from pathlib import Path
+from typing import Iterator
 
 from .config import WORKSPACE_ROOT, REPO_URL
 from .clone import clone_and_checkout, CloneError
@@ -19,7 +24,7 @@ class BootstrapError(Exception):
     pass
 
 
-def bootstrap_workspace(branch: str) -> dict:
+def bootstrap_workspace(branch: str, refresh: bool = False) -> dict:
     """
     Bootstrap a workspace for the given branch.
 
@@ -31,6 +36,7 @@ def bootstrap_workspace(branch: str) -> dict:
 
     Args:
         branch: Branch name to checkout/create
+        refresh: Fetch an existing workspace even if it is already on branch
 
     Returns:
         Dict with status, workspace, branch, action, cloned keys
@@ -44,41 +50,71 @@ def bootstrap_workspace(branch: str) -> dict:
         )
 
     workspace = Path(WORKSPACE_ROOT) / branch
-    workspace.mkdir(parents=True, exist_ok=True)
 
-    try:
-        state = _detect_workspace_state(workspace)
-        logger.info(f"Workspace {workspace} state: {state}")
-
-        if state == "has_git":
-            return update_workspace(workspace, branch)
-        elif state == "has_files":
-            raise BootstrapError(
-                f"Workspace {workspace} has files but no .git directory. "
-                "This indicates a corrupted or manually modified workspace. "
-                "Delete the workspace directory and try again."
-            )
-        else:
-            return clone_and_checkout(workspace, branch)
-
-    except (CloneError, SyncError) as e:
-        raise BootstrapError(str(e)) from e
+    # Different branches bootstrap in parallel; the same branch must not,
+    # or two clones race into one directory. This holds across dispatcher
+    # workers too.
+    with _workspace_lock(branch):
+        try:
+            state = _detect_workspace_state(workspace)
+            logger.info("Workspace %s state: %s", workspace, state)
+
+            if state == "has_git":
+                return update_workspace(workspace, branch, refresh=refresh)
+            elif state == "has_files":
+                raise BootstrapError(
+                    f"Workspace {workspace} has files but no .git directory. "
+                    "This indicates a corrupted or manually modified workspace. "
+                    "Delete the workspace directory and try again."
+                )
+            else:
+                return clone_and_checkout(workspace, branch)
+
+        except (CloneError, SyncError) as e:
+            raise BootstrapError(str(e)) from e
+
+
+def _workspace_lock_path(branch: str) -> Path:
+    """Return the lock file that serializes bootstraps of one branch."""
+    # Git ref names can't start with '.', so the lock directory can't
+    # collide with a workspace. A digest keeps the name unique and short
+    # enough for one path component, however long the branch is. Lock
+    # files are never removed: unlinking one while a bootstrap holds it
+    # would let the next bootstrap lock a fresh inode and run alongside.
+    digest = hashlib.sha256(branch.encode()).hexdigest()
+    return Path(WORKSPACE_ROOT) / ".bootstrap-locks" / digest
+
+
+@contextlib.contextmanager
+def _workspace_lock(branch: str) -> Iterator[None]:
+    """Hold the lock file that serializes bootstraps of one branch."""
+    lock_path = _workspace_lock_path(branch)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "w") as lock_file:
+        # flock locks belong to the open file, so this also serializes
+        # threads of the same worker.
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
 
 
 def _detect_workspace_state(workspace: Path) -> str:
     """
-    Detect workspace state.
+    Detect workspace state, creating the directory if it doesn't exist.
 
     Returns:
         "has_git" - existing git repository
         "has_files" - files present but no .git
         "empty" - no files
     """
-    git_dir = workspace / ".git"
-    if git_dir.exists():
-        return "has_git"
-
-    if any(workspace.iterdir()):
-        return "has_files"
-
-    return "empty"
+    try:
+        with os.scandir(workspace) as entries:
+            has_files = False
+            for entry in entries:
+                if entry.name == ".git":
+                    return "has_git"
+                has_files = True
+    except FileNotFoundError:
+        workspace.mkdir(parents=True, exist_ok=True)
+        return "empty"
+
+    return "has_files" if has_files else "empty"
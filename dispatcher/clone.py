@@ -6,8 +6,10 @@ Handles cloning a repository into an empty workspace directory.
 import logging
 from pathlib import Path
 
-from .config import REPO_URL
-from .git import execute_with_auth, execute
+from .config import CLONE_FILTER, REPO_URL, SHALLOW_BOOTSTRAP
+from .git import execute_with_auth, execute_quiet
+from .mirror import reference_mirror
+from .remote_branches import remote_branch_exists
 
 logger = logging.getLogger(__name__)
 
@@ -31,15 +33,38 @@ def clone_and_checkout(workspace: Path, branch: str) -> dict:
     Raises:
         CloneError on failure
     """
+    # Cloning straight onto an existing branch writes its worktree once,
+    # instead of checking out the default branch and then switching.
+    exists_on_remote = remote_branch_exists(branch)
+
+    clone_args = ["clone"]
+    if SHALLOW_BOOTSTRAP:
+        # A new branch starts from the default branch's tip, so either way
+        # only the one branch being checked out is needed.
+        clone_args += ["--depth=1", "--single-branch", "--no-tags"]
+    if CLONE_FILTER:
+        clone_args.append(f"--filter={CLONE_FILTER}")
+    if exists_on_remote:
+        clone_args += ["--branch", branch]
+    mirror = reference_mirror()
+    if mirror:
+        # Dissociating copies the borrowed objects in, so the workspace never
+        # breaks when the mirror is pruned or removed.
+        clone_args += ["--reference-if-able", mirror, "--dissociate"]
+
     result = execute_with_auth(
-        ["clone", REPO_URL, str(workspace)],
+        clone_args + [REPO_URL, str(workspace)],
         cwd=str(workspace.parent)
     )
 
     if result.exit_code != 0:
         raise CloneError(f"Failed to clone repository: {result.stderr}")
 
-    action = _checkout_branch(workspace, branch)
+    if exists_on_remote:
+        action = "checked_out"
+    else:
+        _create_branch(workspace, branch)
+        action = "created"
 
     return {
         "status": "success",
@@ -50,28 +75,9 @@ def clone_and_checkout(workspace: Path, branch: str) -> dict:
     }
 
 
-def _checkout_branch(workspace: Path, branch: str) -> str:
-    """
-    Checkout branch, creating it if it doesn't exist on remote.
-
-    Returns action string: "checked_out" or "created"
-    """
-    if _branch_exists_on_remote(workspace, branch):
-        result = execute(["checkout", branch], cwd=str(workspace))
-        if result.exit_code != 0:
-            raise CloneError(f"Failed to checkout branch {branch}: {result.stderr}")
-        return "checked_out"
-    else:
-        result = execute(["checkout", "-b", branch], cwd=str(workspace))
-        if result.exit_code != 0:
-            raise CloneError(f"Failed to create branch {branch}: {result.stderr}")
-        return "created"
-
+def _create_branch(workspace: Path, branch: str) -> None:
+    """Create branch from the default branch's head."""
+    result = execute_quiet(["checkout", "-b", branch], cwd=str(workspace))
+    if result.exit_code != 0:
+        raise CloneError(f"Failed to create branch {branch}: {result.stderr}")
 
-def _branch_exists_on_remote(workspace: Path, branch: str) -> bool:
-    """Check if branch exists on origin."""
-    result = execute(
-        ["ls-remote", "--heads", "origin", branch],
-        cwd=str(workspace)
-    )
-    return branch in result.stdout
@@ -55,26 +55,33 @@ def classify(args: list[str]) -> tuple[CommandCategory, Optional[str]]:
 
     Returns (category, deny_message). deny_message is only set for DENIED.
     """
-    cmd = get_subcommand(args)
-    if cmd is None:
-        return CommandCategory.UNKNOWN, None
+    return classify_subcommand(get_subcommand(args))
 
-    if cmd in DENYLIST_MESSAGES:
-        return CommandCategory.DENIED, DENYLIST_MESSAGES[cmd]
 
-    if cmd in ALLOWLIST_LOCAL:
-        return CommandCategory.LOCAL, None
-
-    if cmd in ALLOWLIST_BRANCH:
-        return CommandCategory.BRANCH, None
-
-    if cmd in ALLOWLIST_MERGE:
-        return CommandCategory.MERGE, None
-
-    if cmd in ALLOWLIST_REMOTE_READ:
-        return CommandCategory.REMOTE_READ, None
-
-    if cmd in ALLOWLIST_REMOTE_WRITE:
-        return CommandCategory.REMOTE_WRITE, None
+def classify_subcommand(cmd: Optional[str]) -> tuple[CommandCategory, Optional[str]]:
+    """
+    Classify an already-extracted git subcommand.
 
-    return CommandCategory.UNKNOWN, None
+    Lets callers that need the subcommand themselves scan args only once.
+    """
+    return _CLASSIFICATION.get(cmd, (CommandCategory.UNKNOWN, None))
+
+
+def _build_classification() -> dict[str, tuple[CommandCategory, Optional[str]]]:
+    """Flatten the allow and deny lists into one subcommand lookup table."""
+    table: dict[str, tuple[CommandCategory, Optional[str]]] = {}
+    for category, allowlist in (
+        (CommandCategory.REMOTE_WRITE, ALLOWLIST_REMOTE_WRITE),
+        (CommandCategory.REMOTE_READ, ALLOWLIST_REMOTE_READ),
+        (CommandCategory.MERGE, ALLOWLIST_MERGE),
+        (CommandCategory.BRANCH, ALLOWLIST_BRANCH),
+        (CommandCategory.LOCAL, ALLOWLIST_LOCAL),
+    ):
+        table.update(dict.fromkeys(allowlist, (category, None)))
+    # Later entries win, so the denylist overrides any allowlist.
+    for cmd, message in DENYLIST_MESSAGES.items():
+        table[cmd] = (CommandCategory.DENIED, message)
+    return table
+
+
+_CLASSIFICATION = _build_classification()
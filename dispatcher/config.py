@@ -11,6 +11,31 @@ GIT_USER_EMAIL = os.environ.get("GIT_USER_EMAIL", "yolo-cage@localhost")
 GITHUB_PAT = os.environ.get("GITHUB_PAT", "")
 YOLO_CAGE_VERSION = os.environ.get("YOLO_CAGE_VERSION", "0.2.0")
 
+# Uvicorn reads this itself; it is read here to pick the registry's storage.
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", "1"))
+
+# Lets several workers share the registry; a single worker keeps it in memory.
+REGISTRY_PATH = os.environ.get(
+    "REGISTRY_PATH",
+    "/tmp/dispatcher-registry.sqlite3" if WEB_CONCURRENCY > 1 else ":memory:",
+)
+
+# Only safe for public repositories: agents can't fetch omitted objects later.
+CLONE_FILTER = os.environ.get("CLONE_FILTER", "")
+
+# Opt-in because agents see no history until they deepen the clone.
+SHALLOW_BOOTSTRAP = os.environ.get("SHALLOW_BOOTSTRAP", "false").lower() == "true"
+
+# Opt-in because the mirror is an extra copy of the repository on the volume.
+CLONE_MIRROR = os.environ.get("CLONE_MIRROR", "false").lower() == "true"
+
+MIRROR_REFRESH_INTERVAL = float(os.environ.get("MIRROR_REFRESH_INTERVAL", "300"))
+
+# Missing branches are still confirmed with the remote before being created.
+REMOTE_BRANCHES_TTL = float(os.environ.get("REMOTE_BRANCHES_TTL", "10"))
+
+FETCH_JOBS = int(os.environ.get("FETCH_JOBS", "8"))
+
 DEFAULT_PRE_PUSH_HOOKS = [
     # Use --max-depth instead of --since-commit to avoid issues with shallow repos
     "trufflehog git file://. --max-depth=10 --fail --no-update"
@@ -19,6 +44,21 @@ PRE_PUSH_HOOKS = json.loads(
     os.environ.get("PRE_PUSH_HOOKS", json.dumps(DEFAULT_PRE_PUSH_HOOKS))
 )
 
+# Defaults to 1 because hooks share the worktree and may depend on each other.
+PRE_PUSH_HOOK_CONCURRENCY = max(1, int(os.environ.get("PRE_PUSH_HOOK_CONCURRENCY", "1")))
+
+PRE_PUSH_HOOK_BATCH_WINDOW = float(os.environ.get("PRE_PUSH_HOOK_BATCH_WINDOW", "0"))
+
+# Unbounded fan-out from many pods exhausts file descriptors and the workspace disk.
+SUBPROCESS_CONCURRENCY = int(os.environ.get(
+    "SUBPROCESS_CONCURRENCY", str(max(4, (os.cpu_count() or 1) * 3))
+))
+
+# Queues a burst of pod starts instead of running every clone at once.
+BOOTSTRAP_CONCURRENCY = int(os.environ.get(
+    "BOOTSTRAP_CONCURRENCY", str(min(8, os.cpu_count() or 1))
+))
+
 COMMIT_FOOTER = os.environ.get(
     "COMMIT_FOOTER",
     f"Built autonomously using yolo-cage v{YOLO_CAGE_VERSION}"
@@ -1,17 +1,29 @@
 """GitHub CLI command execution."""
 
+import asyncio
+import functools
 import os
-import subprocess
+import shutil
 
 from .config import GITHUB_PAT
 from .models import GhResult
+from .processes import kill_process_group, start_process
+from .subprocess_slots import subprocess_slots
 
+# Resolved once so each exec skips the PATH search. Falls back to the bare
+# name so a missing gh still reports "not installed" per command.
+_GH = shutil.which("gh") or "gh"
+_TIMEOUT_SECONDS = 300
 
+
+# Built once rather than copying os.environ for every gh process; callers
+# must not modify the returned dict.
+@functools.cache
 def _base_env() -> dict:
     """Get base environment variables for gh execution."""
     env = os.environ.copy()
-    # gh CLI uses GITHUB_TOKEN for authentication
     if GITHUB_PAT:
+        # gh CLI uses GITHUB_TOKEN for authentication
         env["GITHUB_TOKEN"] = GITHUB_PAT
         # Also set GH_TOKEN (gh prefers this)
         env["GH_TOKEN"] = GITHUB_PAT
@@ -25,39 +37,42 @@ def _base_env() -> dict:
     return env
 
 
-def execute(args: list[str], cwd: str) -> GhResult:
-    """Execute a gh CLI command."""
+async def execute(args: list[str], cwd: str) -> GhResult:
+    """Execute a gh CLI command without blocking the event loop."""
     env = _base_env()
 
     try:
-        result = subprocess.run(
-            ["gh"] + args,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=300,
-            env=env,
-        )
-        return GhResult(
-            exit_code=result.returncode,
-            stdout=result.stdout,
-            stderr=result.stderr,
-        )
-    except subprocess.TimeoutExpired:
-        return GhResult(
-            exit_code=1,
-            stdout="",
-            stderr="yolo-cage: gh command timed out after 5 minutes",
-        )
+        async with subprocess_slots:
+            process = await start_process(
+                _GH, *args,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                await kill_process_group(process)
+                return GhResult(
+                    exit_code=1,
+                    stdout=b"",
+                    stderr=b"yolo-cage: gh command timed out after 5 minutes",
+                )
+            except BaseException:
+                # Cancelled: gh must not keep running with the token once its slot is free.
+                await kill_process_group(process)
+                raise
+        return GhResult(exit_code=process.returncode, stdout=stdout, stderr=stderr)
     except FileNotFoundError:
         return GhResult(
             exit_code=1,
-            stdout="",
-            stderr="yolo-cage: gh CLI not installed",
+            stdout=b"",
+            stderr=b"yolo-cage: gh CLI not installed",
         )
     except Exception as e:
         return GhResult(
             exit_code=1,
-            stdout="",
-            stderr=f"yolo-cage: failed to execute gh: {e}",
+            stdout=b"",
+            stderr=f"yolo-cage: failed to execute gh: {e}".encode(),
         )
@@ -135,31 +135,47 @@ def classify_gh(args: list[str]) -> tuple[GhCommandCategory, Optional[str]]:
 
     Returns (category, deny_message). deny_message is only set for BLOCKED.
     """
-    main_cmd, sub_cmd = get_gh_subcommand(args)
-
-    if main_cmd is None:
-        return GhCommandCategory.UNKNOWN, None
-
-    # Check if entirely blocked
-    if main_cmd in FULLY_BLOCKED_COMMANDS:
-        return GhCommandCategory.BLOCKED, FULLY_BLOCKED_COMMANDS[main_cmd]
-
-    # Check if subcommand is specifically blocked
-    if main_cmd in BLOCKED_COMMANDS:
-        blocked_subs = BLOCKED_COMMANDS[main_cmd]
-        if sub_cmd in blocked_subs:
-            return GhCommandCategory.BLOCKED, blocked_subs[sub_cmd]
-
-    # Check if command is allowed
-    if main_cmd in ALLOWED_COMMANDS:
-        allowed_subs = ALLOWED_COMMANDS[main_cmd]
-        if allowed_subs is None:
-            # All subcommands allowed
-            return GhCommandCategory.ALLOWED, None
-        if sub_cmd in allowed_subs:
-            return GhCommandCategory.ALLOWED, None
-        # Main command known but subcommand not in allowed list
-        return GhCommandCategory.UNKNOWN, None
-
-    # Unknown command
-    return GhCommandCategory.UNKNOWN, None
+    return _classify_gh_subcommand(*get_gh_subcommand(args))
+
+
+def _classify_gh_subcommand(
+    main_cmd: Optional[str],
+    sub_cmd: Optional[str],
+) -> tuple[GhCommandCategory, Optional[str]]:
+    """Look up a gh command's verdict; subcommand entries win over whole-command ones."""
+    unknown = (GhCommandCategory.UNKNOWN, None)
+    return _BY_SUBCOMMAND.get((main_cmd, sub_cmd)) or _BY_COMMAND.get(main_cmd, unknown)
+
+
+def _build_classification() -> tuple[dict, dict]:
+    """
+    Flatten the allow and block lists into two lookup tables.
+
+    Returns (by_subcommand, by_command). by_subcommand is keyed by
+    (main_cmd, sub_cmd) and is consulted first; by_command covers commands
+    whose every subcommand shares one verdict.
+    """
+    allowed = (GhCommandCategory.ALLOWED, None)
+    by_subcommand: dict[tuple[str, str], tuple[GhCommandCategory, Optional[str]]] = {}
+    by_command: dict[str, tuple[GhCommandCategory, Optional[str]]] = {}
+
+    for main_cmd, subs in ALLOWED_COMMANDS.items():
+        if subs is None:
+            by_command[main_cmd] = allowed
+        else:
+            by_subcommand.update({(main_cmd, sub): allowed for sub in subs})
+
+    # Blocked subcommands override allowed ones
+    for main_cmd, subs in BLOCKED_COMMANDS.items():
+        for sub, message in subs.items():
+            by_subcommand[(main_cmd, sub)] = (GhCommandCategory.BLOCKED, message)
+
+    # Fully blocked commands override everything, including subcommand entries
+    for main_cmd, message in FULLY_BLOCKED_COMMANDS.items():
+        by_command[main_cmd] = (GhCommandCategory.BLOCKED, message)
+        by_subcommand = {key: verdict for key, verdict in by_subcommand.items() if key[0] != main_cmd}
+
+    return by_subcommand, by_command
+
+
+_BY_SUBCOMMAND, _BY_COMMAND = _build_classification()
@@ -1,33 +1,82 @@
 """Git command execution."""
 
+import asyncio
+import functools
 import os
+import shutil
 import subprocess
 from typing import Optional
 
-from .config import GIT_USER_NAME, GIT_USER_EMAIL, GITHUB_PAT
-from .models import GitResult
+from .config import FETCH_JOBS, GIT_USER_NAME, GIT_USER_EMAIL, GITHUB_PAT
+from .models import GitOutput, GitResult
+from .processes import kill_process_group, start_process
+from .subprocess_slots import subprocess_slots
 
+# Resolved once so each exec skips the PATH search. Falls back to the bare
+# name so a missing binary still surfaces as a per-command error.
+_GIT = shutil.which("git") or "git"
+_TIMEOUT_SECONDS = 300
 
+
+# Built once, since configuration doesn't change; callers must not modify them.
+@functools.cache
 def _safe_directory_env() -> dict:
     """Get environment variables for safe directory access."""
     env = os.environ.copy()
+    env["GIT_CONFIG_COUNT"] = "0"
     # Trust workspace directories regardless of ownership.
     # Kubernetes creates subPath mount directories as root before the
     # dispatcher (running as uid 1000) can clone into them.
-    env["GIT_CONFIG_COUNT"] = "1"
-    env["GIT_CONFIG_KEY_0"] = "safe.directory"
-    env["GIT_CONFIG_VALUE_0"] = "*"
+    _add_config(env, "safe.directory", "*")
     return env
 
 
-def get_current_branch(cwd: str) -> Optional[str]:
-    """Get the current branch in the given working directory."""
+def _add_config(env: dict, key: str, value: str) -> None:
+    """Append a git config entry to env's GIT_CONFIG_* variables."""
+    index = int(env["GIT_CONFIG_COUNT"])
+    env[f"GIT_CONFIG_KEY_{index}"] = key
+    env[f"GIT_CONFIG_VALUE_{index}"] = value
+    env["GIT_CONFIG_COUNT"] = str(index + 1)
+
+
+def _read_head(cwd: str) -> Optional[str]:
+    """Read HEAD from the repository at cwd, or None if there is no .git/HEAD file there."""
+    try:
+        with open(os.path.join(cwd, ".git", "HEAD")) as head_file:
+            return head_file.read().strip()
+    except OSError:
+        return None
+
+
+def _is_object_id(value: str) -> bool:
+    """Check whether value is a full SHA-1 or SHA-256 object id."""
+    return len(value) in (40, 64) and all(c in "0123456789abcdef" for c in value)
+
+
+def get_current_branch(cwd: str, is_workspace_root: bool = False) -> Optional[str]:
+    """
+    Get the current branch in the given working directory.
+
+    Pass is_workspace_root only when cwd is a workspace directory itself.
+    """
     import logging
     logger = logging.getLogger(__name__)
 
+    # Reading HEAD directly spares a git process on every push and merge
+    # check. It is only trusted at a workspace root, whose .git is the
+    # repository the dispatcher cloned: below it, the agent can plant a
+    # .git/HEAD that git itself would ignore. Anything else asks git.
+    if is_workspace_root:
+        head = _read_head(cwd)
+        if head is not None:
+            if head.startswith("ref: refs/heads/"):
+                return head[len("ref: refs/heads/"):]
+            if _is_object_id(head):
+                return None
+
     try:
         result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+            [_GIT, "rev-parse", "--abbrev-ref", "HEAD"],
             cwd=cwd,
             capture_output=True,
             text=True,
@@ -39,17 +88,22 @@ def get_current_branch(cwd: str) -> Optional[str]:
             # "HEAD" means detached HEAD state
             return branch if branch != "HEAD" else None
         else:
-            logger.warning(f"git rev-parse failed in {cwd}: {result.stderr.strip()}")
+            logger.warning("git rev-parse failed in %s: %s", cwd, result.stderr.strip())
     except FileNotFoundError:
-        logger.warning(f"Directory does not exist: {cwd}")
+        logger.warning("Directory does not exist: %s", cwd)
     except Exception as e:
-        logger.warning(f"Failed to get branch in {cwd}: {e}")
+        logger.warning("Failed to get branch in %s: %s", cwd, e)
     return None
 
 
+@functools.cache
 def _base_env() -> dict:
     """Get base environment variables for git execution."""
-    env = _safe_directory_env()
+    env = dict(_safe_directory_env())
+    # v2 lets the server filter refs instead of advertising all of them.
+    _add_config(env, "protocol.version", "2")
+    _add_config(env, "fetch.parallel", str(FETCH_JOBS))
+    _add_config(env, "submodule.fetchJobs", str(FETCH_JOBS))
     env["GIT_AUTHOR_NAME"] = GIT_USER_NAME
     env["GIT_AUTHOR_EMAIL"] = GIT_USER_EMAIL
     env["GIT_COMMITTER_NAME"] = GIT_USER_NAME
@@ -58,21 +112,26 @@ def _base_env() -> dict:
     return env
 
 
-def _run_git(args: list[str], cwd: str, env: dict) -> GitResult:
-    """Run a git command with the given environment."""
+def _run_git(args: list[str], cwd: str, env: dict, capture_stdout: bool = True) -> GitResult:
+    """
+    Run a git command with the given environment.
+
+    With capture_stdout=False, stdout is discarded and stderr is only decoded
+    when the command fails, for callers that just need the exit code.
+    """
     try:
         result = subprocess.run(
-            ["git"] + args,
+            [_GIT] + args,
             cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=300,
+            stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=_TIMEOUT_SECONDS,
             env=env,
         )
         return GitResult(
             exit_code=result.returncode,
-            stdout=result.stdout,
-            stderr=result.stderr,
+            stdout=result.stdout.decode(errors="replace") if capture_stdout else "",
+            stderr=result.stderr.decode(errors="replace") if capture_stdout or result.returncode != 0 else "",
         )
     except subprocess.TimeoutExpired:
         return GitResult(
@@ -88,27 +147,76 @@ def _run_git(args: list[str], cwd: str, env: dict) -> GitResult:
         )
 
 
+async def _run_git_async(args: list[str], cwd: str, env: dict) -> GitOutput:
+    """Run a git command without blocking the event loop."""
+    try:
+        async with subprocess_slots:
+            process = await start_process(
+                _GIT, *args,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                await kill_process_group(process)
+                return GitOutput(
+                    exit_code=1,
+                    stdout=b"",
+                    stderr=b"yolo-cage: git command timed out after 5 minutes",
+                )
+            except BaseException:
+                # Cancelled: git must not keep running with the token once its slot is free.
+                await kill_process_group(process)
+                raise
+        return GitOutput(exit_code=process.returncode, stdout=stdout, stderr=stderr)
+    except Exception as e:
+        return GitOutput(
+            exit_code=1,
+            stdout=b"",
+            stderr=f"yolo-cage: failed to execute git: {e}".encode(),
+        )
+
+
+@functools.cache
+def _auth_env() -> dict:
+    """Get an environment with GitHub credentials available to git."""
+    if not GITHUB_PAT:
+        return _base_env()
+    env = dict(_base_env())
+
+    # Read the token from the environment so it is never on disk or in argv.
+    env["GITHUB_PAT"] = GITHUB_PAT
+    _add_config(env, "credential.helper", "")
+    _add_config(env, "credential.helper", (
+        '!f() { test "$1" = get || return 0; '
+        'echo username=x-access-token; echo "password=$GITHUB_PAT"; }; f'
+    ))
+    return env
+
+
 def execute(args: list[str], cwd: str) -> GitResult:
     """Execute a git command (no authentication)."""
     return _run_git(args, cwd, _base_env())
 
 
+def execute_quiet(args: list[str], cwd: str) -> GitResult:
+    """Execute a git command (no authentication) whose stdout is not needed."""
+    return _run_git(args, cwd, _base_env(), capture_stdout=False)
+
+
 def execute_with_auth(args: list[str], cwd: str) -> GitResult:
     """Execute a git command with GitHub authentication."""
-    env = _base_env()
+    return _run_git(args, cwd, _auth_env())
 
-    if not GITHUB_PAT:
-        return _run_git(args, cwd, env)
 
-    # Use GIT_ASKPASS to provide credentials
-    askpass_script = "/tmp/git-askpass.sh"
-    try:
-        with open(askpass_script, "w") as f:
-            f.write(f"#!/bin/bash\necho {GITHUB_PAT}\n")
-        os.chmod(askpass_script, 0o700)
-        env["GIT_ASKPASS"] = askpass_script
-
-        return _run_git(args, cwd, env)
-    finally:
-        if os.path.exists(askpass_script):
-            os.remove(askpass_script)
+async def execute_async(args: list[str], cwd: str) -> GitOutput:
+    """Execute a git command (no authentication) without blocking the event loop."""
+    return await _run_git_async(args, cwd, _base_env())
+
+
+async def execute_with_auth_async(args: list[str], cwd: str) -> GitOutput:
+    """Execute a git command with GitHub authentication without blocking the event loop."""
+    return await _run_git_async(args, cwd, _auth_env())
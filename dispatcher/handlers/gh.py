@@ -4,10 +4,10 @@ from fastapi.responses import PlainTextResponse
 
 from ..gh import execute as gh_execute
 from ..gh_commands import GhCommandCategory, classify_gh
-from ..responses import denial, command_result
+from ..responses import policy_denial, command_result
 
 
-def handle(args: list[str], cwd: str) -> PlainTextResponse:
+async def handle(args: list[str], cwd: str) -> PlainTextResponse:
     """
     Handle a gh CLI command with policy enforcement.
 
@@ -21,11 +21,11 @@ def handle(args: list[str], cwd: str) -> PlainTextResponse:
     category, deny_message = classify_gh(args)
 
     if category == GhCommandCategory.BLOCKED:
-        return denial(deny_message + "\n")
+        return policy_denial(deny_message)
 
     if category == GhCommandCategory.UNKNOWN:
-        return denial("yolo-cage: unrecognized or disallowed gh operation\n")
+        return policy_denial("yolo-cage: unrecognized or disallowed gh operation")
 
     # Allowed: execute with authentication
-    result = gh_execute(args, cwd)
+    result = await gh_execute(args, cwd)
     return command_result(result.stdout + result.stderr, result.exit_code)
@@ -1,15 +1,19 @@
 """Git command handling and dispatch."""
 
+import asyncio
+from typing import Awaitable, Callable, Optional
+
 from fastapi.responses import PlainTextResponse
 
-from ..commands import CommandCategory, classify, get_subcommand
-from ..git import execute, execute_with_auth
-from ..hooks import run_pre_push_hooks
+from ..commands import CommandCategory, classify_subcommand, get_subcommand
+from ..git import execute_async, execute_with_auth_async
+from ..hooks import hook_batcher
 from ..policy import check_branch_switch, check_merge_allowed, check_push_allowed
-from ..responses import denial, command_result
+from .. import remote_branches
+from ..responses import denial, policy_denial, command_result
 
 
-def handle(args: list[str], cwd: str, assigned_branch: str) -> PlainTextResponse:
+async def handle(args: list[str], cwd: str, assigned_branch: str) -> PlainTextResponse:
     """
     Handle a git command with policy enforcement.
 
@@ -21,47 +25,89 @@ def handle(args: list[str], cwd: str, assigned_branch: str) -> PlainTextResponse
     Returns:
         PlainTextResponse with command output and exit code header
     """
-    category, deny_message = classify(args)
-
-    if category == CommandCategory.DENIED:
-        return denial(deny_message + "\n")
-
-    if category == CommandCategory.UNKNOWN:
-        return denial("yolo-cage: unrecognized or disallowed git operation\n")
-
-    # Branch switch: execute but warn if switching away
-    if category == CommandCategory.BRANCH:
-        warning = check_branch_switch(args, assigned_branch)
-        result = execute(args, cwd)
-        output = (warning + "\n" if warning else "") + result.stdout + result.stderr
-        return command_result(output, result.exit_code)
-
-    # Merge: must be on assigned branch
-    if category == CommandCategory.MERGE:
-        error = check_merge_allowed(cwd, assigned_branch, get_subcommand(args))
-        if error:
-            return denial(error)
-        result = execute(args, cwd)
-        return command_result(result.stdout + result.stderr, result.exit_code)
-
-    # Push: branch enforcement + pre-push hooks
-    if category == CommandCategory.REMOTE_WRITE:
-        error = check_push_allowed(args, cwd, assigned_branch)
-        if error:
-            return denial(error)
-
-        hook_ok, hook_output = run_pre_push_hooks(cwd)
-        if not hook_ok:
-            return denial(f"yolo-cage: push rejected by pre-push hooks\n\n{hook_output}")
-
-        result = execute_with_auth(args, cwd)
-        return command_result(result.stdout + result.stderr, result.exit_code)
-
-    # Remote read (fetch/pull): just needs auth
-    if category == CommandCategory.REMOTE_READ:
-        result = execute_with_auth(args, cwd)
-        return command_result(result.stdout + result.stderr, result.exit_code)
-
-    # Local operations: no restrictions
-    result = execute(args, cwd)
+    subcommand = get_subcommand(args)
+    category, deny_message = classify_subcommand(subcommand)
+    return await _HANDLERS[category](args, cwd, assigned_branch, subcommand, deny_message)
+
+
+async def _handle_denied(
+    args: list[str], cwd: str, assigned_branch: str, subcommand: str, deny_message: Optional[str]
+) -> PlainTextResponse:
+    """Refuse a denied command with its explanation."""
+    return policy_denial(deny_message)
+
+
+async def _handle_unknown(
+    args: list[str], cwd: str, assigned_branch: str, subcommand: str, deny_message: Optional[str]
+) -> PlainTextResponse:
+    """Refuse a command that is not on any allowlist."""
+    return policy_denial("yolo-cage: unrecognized or disallowed git operation")
+
+
+async def _handle_branch(
+    args: list[str], cwd: str, assigned_branch: str, subcommand: str, deny_message: Optional[str]
+) -> PlainTextResponse:
+    """Execute a branch switch, warning if it leaves the assigned branch."""
+    warning = check_branch_switch(args, assigned_branch)
+    result = await execute_async(args, cwd)
+    output = (f"{warning}\n".encode() if warning else b"") + result.stdout + result.stderr
+    return command_result(output, result.exit_code)
+
+
+async def _handle_merge(
+    args: list[str], cwd: str, assigned_branch: str, subcommand: str, deny_message: Optional[str]
+) -> PlainTextResponse:
+    """Execute a merge only while on the assigned branch."""
+    error = await asyncio.to_thread(check_merge_allowed, cwd, assigned_branch, subcommand)
+    if error:
+        return denial(error)
+    result = await execute_async(args, cwd)
     return command_result(result.stdout + result.stderr, result.exit_code)
+
+
+async def _handle_remote_write(
+    args: list[str], cwd: str, assigned_branch: str, subcommand: str, deny_message: Optional[str]
+) -> PlainTextResponse:
+    """Execute a push after branch enforcement and pre-push hooks."""
+    error = await asyncio.to_thread(check_push_allowed, args, cwd, assigned_branch)
+    if error:
+        return denial(error)
+
+    hook_ok, hook_output = await hook_batcher.submit(cwd)
+    if not hook_ok:
+        return denial(f"yolo-cage: push rejected by pre-push hooks\n\n{hook_output}")
+
+    result = await execute_with_auth_async(args, cwd)
+    if result.exit_code == 0:
+        # invalidate waits for any ls-remote in flight, so keep it off the loop.
+        await asyncio.to_thread(remote_branches.invalidate)
+    return command_result(result.stdout + result.stderr, result.exit_code)
+
+
+async def _handle_remote_read(
+    args: list[str], cwd: str, assigned_branch: str, subcommand: str, deny_message: Optional[str]
+) -> PlainTextResponse:
+    """Execute a fetch or pull with authentication."""
+    result = await execute_with_auth_async(args, cwd)
+    return command_result(result.stdout + result.stderr, result.exit_code)
+
+
+async def _handle_local(
+    args: list[str], cwd: str, assigned_branch: str, subcommand: str, deny_message: Optional[str]
+) -> PlainTextResponse:
+    """Execute a local operation without restrictions."""
+    result = await execute_async(args, cwd)
+    return command_result(result.stdout + result.stderr, result.exit_code)
+
+
+_Handler = Callable[[list[str], str, str, str, Optional[str]], Awaitable[PlainTextResponse]]
+
+_HANDLERS: dict[CommandCategory, _Handler] = {
+    CommandCategory.DENIED: _handle_denied,
+    CommandCategory.UNKNOWN: _handle_unknown,
+    CommandCategory.BRANCH: _handle_branch,
+    CommandCategory.MERGE: _handle_merge,
+    CommandCategory.REMOTE_WRITE: _handle_remote_write,
+    CommandCategory.REMOTE_READ: _handle_remote_read,
+    CommandCategory.LOCAL: _handle_local,
+}
@@ -1,14 +1,17 @@
 """Pre-push hook execution."""
 
+import asyncio
 import logging
-import subprocess
 from dataclasses import dataclass
 from typing import Optional
 
-from .config import PRE_PUSH_HOOKS
+from .config import PRE_PUSH_HOOKS, PRE_PUSH_HOOK_BATCH_WINDOW, PRE_PUSH_HOOK_CONCURRENCY
+from .processes import kill_process_group, start_shell
 
 logger = logging.getLogger(__name__)
 
+_TIMEOUT_SECONDS = 120
+
 
 @dataclass
 class HookResult:
@@ -18,30 +21,35 @@ class HookResult:
     hook_cmd: str
 
 
-def _run_single_hook(hook_cmd: str, cwd: str) -> HookResult:
+async def _run_single_hook(hook_cmd: str, cwd: str) -> HookResult:
     """Run a single hook command. Returns HookResult."""
-    logger.info(f"Running pre-push hook: {hook_cmd}")
+    logger.info("Running pre-push hook: %s", hook_cmd)
     try:
-        result = subprocess.run(
+        process = await start_shell(
             hook_cmd,
-            shell=True,
             cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=120,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
-        output = result.stdout + result.stderr
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            # Another hook failed; don't leave this one running.
+            await kill_process_group(process)
+            raise
+        except asyncio.TimeoutError:
+            await kill_process_group(process)
+            return HookResult(
+                success=False,
+                output=f"Hook timed out: {hook_cmd}",
+                hook_cmd=hook_cmd,
+            )
+        output = stdout.decode(errors="replace") + stderr.decode(errors="replace")
         return HookResult(
-            success=(result.returncode == 0),
+            success=(process.returncode == 0),
             output=output,
             hook_cmd=hook_cmd,
         )
-    except subprocess.TimeoutExpired:
-        return HookResult(
-            success=False,
-            output=f"Hook timed out: {hook_cmd}",
-            hook_cmd=hook_cmd,
-        )
     except Exception as e:
         return HookResult(
             success=False,
@@ -50,22 +58,68 @@ def _run_single_hook(hook_cmd: str, cwd: str) -> HookResult:
         )
 
 
-def run_pre_push_hooks(cwd: str) -> tuple[bool, str]:
+async def run_pre_push_hooks(cwd: str) -> tuple[bool, str]:
     """
-    Run all pre-push hooks.
+    Run all pre-push hooks, stopping the rest as soon as one fails.
 
-    Returns (success, combined_output).
+    Returns (success, combined_output). Output is in the order the hooks
+    are configured, and only includes hooks that finished.
     """
     if not PRE_PUSH_HOOKS:
         return True, ""
 
-    outputs = []
-    for hook_cmd in PRE_PUSH_HOOKS:
-        result = _run_single_hook(hook_cmd, cwd)
-        if result.output:
-            outputs.append(result.output)
+    slots = asyncio.Semaphore(PRE_PUSH_HOOK_CONCURRENCY)
+    tasks: list[asyncio.Task] = []
+
+    async def run_hook(hook_cmd: str) -> HookResult:
+        async with slots:
+            result = await _run_single_hook(hook_cmd, cwd)
         if not result.success:
-            logger.warning(f"Pre-push hook failed: {result.hook_cmd}")
-            return False, "\n".join(outputs)
+            logger.warning("Pre-push hook failed: %s", result.hook_cmd)
+            # Hooks still waiting for a slot never start.
+            for task in tasks:
+                if task is not asyncio.current_task():
+                    task.cancel()
+        return result
+
+    tasks.extend(asyncio.create_task(run_hook(hook_cmd)) for hook_cmd in PRE_PUSH_HOOKS)
+    finished = [
+        result for result in await asyncio.gather(*tasks, return_exceptions=True)
+        if isinstance(result, HookResult)
+    ]
+
+    success = len(finished) == len(tasks) and all(result.success for result in finished)
+    return success, "\n".join(result.output for result in finished if result.output)
+
+
+class HookBatcher:
+    """
+    Coalesces pre-push hook runs for the same workspace.
+
+    Pushes that arrive while a batch for their workspace is still waiting to
+    start share its result. Once the hooks begin running, later pushes open a
+    new batch, so every push is checked by a run that started after it asked.
+    """
+
+    def __init__(self, window_seconds: float):
+        self._window_seconds = window_seconds
+        self._pending: dict[str, asyncio.Task] = {}
+
+    async def submit(self, cwd: str) -> tuple[bool, str]:
+        """Wait for the next hook run covering cwd. Returns (success, combined_output)."""
+        batch = self._pending.get(cwd)
+        if batch is None:
+            batch = asyncio.create_task(self._run_batch(cwd))
+            self._pending[cwd] = batch
+        return await asyncio.shield(batch)
+
+    async def _run_batch(self, cwd: str) -> tuple[bool, str]:
+        try:
+            if self._window_seconds > 0:
+                await asyncio.sleep(self._window_seconds)
+        finally:
+            del self._pending[cwd]
+        return await run_pre_push_hooks(cwd)
+
 
-    return True, "\n".join(outputs)
+hook_batcher = HookBatcher(PRE_PUSH_HOOK_BATCH_WINDOW)
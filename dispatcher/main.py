@@ -2,7 +2,6 @@
 
 import uvicorn
 
-from .app import app
-
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    # An import string lets uvicorn spawn WEB_CONCURRENCY worker processes.
+    uvicorn.run("dispatcher.app:app", host="0.0.0.0", port=8080, loop="uvloop", http="httptools")
@@ -0,0 +1,88 @@
+"""Shared mirror of the managed repository for bootstrap clones.
+
+Every workspace is a clone of the same repository. With a local bare
+mirror as a reference, each clone only downloads objects the mirror
+doesn't have yet, instead of the whole repository again.
+"""
+
+import fcntl
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from .config import CLONE_MIRROR, MIRROR_REFRESH_INTERVAL, REPO_URL, WORKSPACE_ROOT
+from .git import execute_quiet, execute_with_auth
+
+logger = logging.getLogger(__name__)
+
+# Git ref names can't start with '.', so no branch workspace can collide.
+MIRROR_PATH = Path(WORKSPACE_ROOT) / ".mirror"
+_LOCK_PATH = Path(WORKSPACE_ROOT) / ".mirror.lock"
+
+_lock = threading.Lock()
+_refreshed_at: Optional[float] = None
+
+
+def reference_mirror() -> Optional[str]:
+    """
+    Get the path of the mirror to clone with, creating or refreshing it as needed.
+
+    Returns None when mirroring is disabled or the mirror can't be created;
+    clones then fall back to downloading everything from the remote.
+    """
+    global _refreshed_at
+    if not CLONE_MIRROR:
+        return None
+
+    # The thread lock keeps this worker's bootstraps from queueing on the
+    # file lock; the file lock covers the other dispatcher workers.
+    with _lock:
+        if _refreshed_at is not None and time.monotonic() - _refreshed_at < MIRROR_REFRESH_INTERVAL:
+            return str(MIRROR_PATH)
+
+        with open(_LOCK_PATH, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if MIRROR_PATH.exists():
+                ok = _refresh_mirror()
+            else:
+                ok = _create_mirror()
+
+        if not MIRROR_PATH.exists():
+            return None
+        if ok:
+            _refreshed_at = time.monotonic()
+        return str(MIRROR_PATH)
+
+
+def _create_mirror() -> bool:
+    """Clone the mirror, moving it into place only once complete."""
+    staging = MIRROR_PATH.with_name(f".mirror.tmp-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    # A bare clone fetches branches only. --mirror would also fetch every
+    # other ref on the remote, which on GitHub includes refs/pull/* for
+    # every pull request ever opened. Refreshes keep to branches too.
+    result = execute_with_auth(["clone", "--bare", REPO_URL, str(staging)], cwd=WORKSPACE_ROOT)
+    if result.exit_code == 0:
+        result = execute_quiet(
+            ["config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*"], cwd=str(staging)
+        )
+    if result.exit_code != 0:
+        logger.warning("Failed to create repository mirror: %s", result.stderr)
+        shutil.rmtree(staging, ignore_errors=True)
+        return False
+    staging.rename(MIRROR_PATH)
+    logger.info("Created repository mirror at %s", MIRROR_PATH)
+    return True
+
+
+def _refresh_mirror() -> bool:
+    """Fetch new objects into the mirror. A stale mirror is still usable."""
+    result = execute_with_auth(["fetch", "--prune", "origin"], cwd=str(MIRROR_PATH))
+    if result.exit_code != 0:
+        logger.warning("Failed to refresh repository mirror: %s", result.stderr)
+        return False
+    return True
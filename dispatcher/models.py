@@ -1,22 +1,38 @@
 """Request and response models."""
 
+from dataclasses import dataclass
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class GitRequest(BaseModel):
     """Request from git shim in sandbox pod."""
+    model_config = ConfigDict(strict=True)
+
     args: list[str]
     cwd: str
 
 
-class GitResult(BaseModel):
+# The result types are plain slotted dataclasses rather than pydantic models:
+# one is built for every subprocess run and none crosses the API boundary.
+@dataclass(slots=True, frozen=True)
+class GitResult:
     """Result of a git operation."""
     exit_code: int
     stdout: str
     stderr: str
 
 
+# Output relayed to the agent stays undecoded: the shims write it out as
+# bytes, so decoding here would only be undone when building the response.
+@dataclass(slots=True, frozen=True)
+class GitOutput:
+    """Result of an agent's git command, with output as git wrote it."""
+    exit_code: int
+    stdout: bytes
+    stderr: bytes
+
+
 class PolicyViolation(BaseModel):
     """A branch policy violation."""
     message: str
@@ -24,15 +40,50 @@ class PolicyViolation(BaseModel):
 
 class GhRequest(BaseModel):
     """Request from gh shim in sandbox pod."""
+    model_config = ConfigDict(strict=True)
+
     args: list[str]
     cwd: str
 
 
-class GhResult(BaseModel):
-    """Result of a gh operation."""
+@dataclass(slots=True, frozen=True)
+class GhResult:
+    """Result of a gh operation, with output as gh wrote it."""
     exit_code: int
-    stdout: str
-    stderr: str
+    stdout: bytes
+    stderr: bytes
+
+
+class HealthResponse(BaseModel):
+    """Dispatcher liveness."""
+    status: str
+
+
+class RegistrationResponse(BaseModel):
+    """Outcome of registering a pod."""
+    status: str
+    ip: str
+    branch: str
+
+
+class DeregistrationResponse(BaseModel):
+    """Outcome of deregistering a pod."""
+    status: str
+    ip: str
+
+
+class RegistryResponse(BaseModel):
+    """All registered pods, keyed by IP."""
+    registry: dict[str, str]
+
+
+class BootstrapResponse(BaseModel):
+    """Outcome of bootstrapping a workspace."""
+    status: str
+    workspace: str
+    branch: str
+    action: str
+    cloned: bool
 
 
 class PodCreateRequest(BaseModel):
@@ -60,3 +111,10 @@ class PodCreateResponse(BaseModel):
     branch: str
     status: str
     message: str
+
+
+class PodDeleteResponse(BaseModel):
+    """Response from pod deletion."""
+    status: str
+    branch: str
+    workspace_cleaned: bool
@@ -1,11 +1,13 @@
 """Path translation between agent and dispatcher filesystems."""
 
+import functools
 import os.path
 
 from .config import WORKSPACE_ROOT
 
 # Agent's workspace path (matches pod mount point)
 AGENT_WORKSPACE = "/home/dev/workspace"
+_AGENT_WORKSPACE_PREFIX = AGENT_WORKSPACE + "/"
 
 
 class InvalidPathError(Exception):
@@ -13,6 +15,13 @@ class InvalidPathError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=1024)
+def workspace_path(branch: str) -> str:
+    """Dispatcher filesystem path of a branch's workspace."""
+    return f"{WORKSPACE_ROOT}/{branch}"
+
+
+@functools.lru_cache(maxsize=1024)
 def translate_cwd(agent_cwd: str, branch: str) -> str:
     """
     Translate agent's cwd to dispatcher's filesystem path.
@@ -25,11 +34,12 @@ def translate_cwd(agent_cwd: str, branch: str) -> str:
     normalized = os.path.normpath(agent_cwd)
 
     if normalized == AGENT_WORKSPACE:
-        return f"{WORKSPACE_ROOT}/{branch}"
-    if normalized.startswith(AGENT_WORKSPACE + "/"):
-        relative = normalized[len(AGENT_WORKSPACE) + 1:]
+        return workspace_path(branch)
+    if normalized.startswith(_AGENT_WORKSPACE_PREFIX):
+        # Keep the leading '/' so the suffix appends directly to the workspace
+        suffix = normalized[len(AGENT_WORKSPACE):]
         # Double-check relative path doesn't escape (belt and suspenders)
-        if ".." in relative:
+        if ".." in suffix:
             raise InvalidPathError(f"Path traversal not allowed: {agent_cwd}")
-        return f"{WORKSPACE_ROOT}/{branch}/{relative}"
+        return workspace_path(branch) + suffix
     raise InvalidPathError(f"Path must be within {AGENT_WORKSPACE}, got: {agent_cwd}")
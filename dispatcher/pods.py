@@ -1,8 +1,8 @@
 """Pod lifecycle management using Kubernetes client."""
 
+import functools
 import logging
 import os
-import re
 import shutil
 from pathlib import Path
 from string import Template
@@ -27,35 +27,53 @@ POD_CPU_REQUEST = os.environ.get("POD_CPU_REQUEST", "500m")
 # Pod template bundled into image at build time
 TEMPLATE_PATH = Path("/app/pod-template.yaml")
 
+# libyaml's loader when PyYAML was built with it, else the pure-Python one.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
+
+# One client per process keeps its connection pool alive between requests
+# and reads the service account files once. The in-cluster loader installs a
+# hook that re-reads the token when it is due, so rotation still applies.
+@functools.cache
 def _init_k8s_client() -> client.CoreV1Api:
     """Initialize Kubernetes client."""
     config.load_incluster_config()
     return client.CoreV1Api()
 
 
+_POD_NAME_SEPARATORS = str.maketrans("/_", "--")
+
+
 def _sanitize_branch(branch: str) -> str:
     """Sanitize branch name for pod name."""
-    return re.sub(r'[/_]', '-', branch.lower())
+    # Must match Branch.to_pod_name in the CLI, which lowercases all of
+    # Unicode, so lower() stays rather than folding ASCII in the table.
+    return branch.lower().translate(_POD_NAME_SEPARATORS)
 
 
 def _pod_name(branch: str) -> str:
     return f"yolo-cage-{_sanitize_branch(branch)}"
 
 
-def _load_pod_template(branch: str) -> dict:
-    """Load pod template and substitute variables."""
+# The template and the settings substituted into it are fixed for the life
+# of the image, so only the branch is filled in per pod.
+@functools.cache
+def _pod_template_text() -> str:
+    """Load the pod template with every variable except the branch substituted."""
     template_text = TEMPLATE_PATH.read_text()
 
-    # Substitute variables
-    substituted = template_text.replace("${BRANCH}", branch)
-    substituted = substituted.replace("${PROXY_BYPASS}", PROXY_BYPASS)
+    substituted = template_text.replace("${PROXY_BYPASS}", PROXY_BYPASS)
     substituted = substituted.replace("${POD_MEMORY_LIMIT}", POD_MEMORY_LIMIT)
     substituted = substituted.replace("${POD_MEMORY_REQUEST}", POD_MEMORY_REQUEST)
     substituted = substituted.replace("${POD_CPU_LIMIT}", POD_CPU_LIMIT)
     substituted = substituted.replace("${POD_CPU_REQUEST}", POD_CPU_REQUEST)
+    return substituted
+
 
-    return yaml.safe_load(substituted)
+def _load_pod_template(branch: str) -> dict:
+    """Load pod template and substitute variables."""
+    substituted = _pod_template_text().replace("${BRANCH}", branch)
+    return yaml.load(substituted, Loader=_YAML_LOADER)
 
 
 def create_pod(branch: str) -> PodCreateResponse:
@@ -78,7 +96,7 @@ def create_pod(branch: str) -> PodCreateResponse:
 
     # Load template and create pod
     manifest = _load_pod_template(branch)
-    logger.info(f"Creating pod {name} for branch {branch}")
+    logger.info("Creating pod %s for branch %s", name, branch)
 
     v1.create_namespaced_pod(namespace=NAMESPACE, body=manifest)
     return PodCreateResponse(
@@ -137,13 +155,13 @@ def delete_pod(branch: str, clean_workspace: bool = False) -> bool:
 
     try:
         v1.delete_namespaced_pod(name=name, namespace=NAMESPACE)
-        logger.info(f"Deleted pod {name}")
+        logger.info("Deleted pod %s", name)
 
         if clean_workspace:
             workspace_path = Path(WORKSPACE_ROOT) / branch
             if workspace_path.exists():
                 shutil.rmtree(workspace_path)
-                logger.info(f"Deleted workspace {workspace_path}")
+                logger.info("Deleted workspace %s", workspace_path)
 
         return True
     except ApiException as e:
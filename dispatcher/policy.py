@@ -4,6 +4,9 @@ from typing import Optional
 
 from .commands import get_subcommand
 from .git import get_current_branch
+from .paths import workspace_path
+
+_CHECKOUT_COMMANDS = frozenset({"checkout", "switch"})
 
 
 def get_checkout_target(args: list[str]) -> Optional[str]:
@@ -13,16 +16,13 @@ def get_checkout_target(args: list[str]) -> Optional[str]:
     Returns the branch name, or None if not switching branches.
     """
     cmd = get_subcommand(args)
-    if cmd not in ("checkout", "switch"):
+    if cmd not in _CHECKOUT_COMMANDS:
         return None
 
-    # Find the argument after 'checkout' or 'switch' that isn't a flag
-    found_cmd = False
-    for arg in args:
-        if arg in ("checkout", "switch"):
-            found_cmd = True
-            continue
-        if found_cmd and not arg.startswith("-"):
+    # The subcommand is the first non-flag argument, so index() finds it
+    # and the target is the next non-flag argument after it.
+    for arg in args[args.index(cmd) + 1:]:
+        if not arg.startswith("-"):
             return arg
 
     return None
@@ -51,7 +51,7 @@ def check_merge_allowed(cwd: str, assigned_branch: str, cmd: str) -> Optional[st
 
     Returns an error message if not allowed, None if allowed.
     """
-    current = get_current_branch(cwd)
+    current = get_current_branch(cwd, is_workspace_root=cwd == workspace_path(assigned_branch))
     if current == assigned_branch:
         return None
 
@@ -107,7 +107,7 @@ def check_push_allowed(
         )
 
     # Must be on assigned branch
-    current = get_current_branch(cwd)
+    current = get_current_branch(cwd, is_workspace_root=cwd == workspace_path(assigned_branch))
     if current is None:
         return (
             f"yolo-cage: could not determine current branch.\n"
@@ -0,0 +1,26 @@
+"""Child processes that can be stopped together with everything they started."""
+
+import asyncio
+import os
+import signal
+
+
+async def start_process(program: str, *args: str, **kwargs) -> asyncio.subprocess.Process:
+    """Start a program in its own process group."""
+    return await asyncio.create_subprocess_exec(program, *args, start_new_session=True, **kwargs)
+
+
+async def start_shell(command: str, **kwargs) -> asyncio.subprocess.Process:
+    """Start a shell command in its own process group."""
+    return await asyncio.create_subprocess_shell(command, start_new_session=True, **kwargs)
+
+
+async def kill_process_group(process: asyncio.subprocess.Process) -> None:
+    """Kill a process and everything it started, then reap it."""
+    # git starts ssh and credential helpers, and hooks run through a shell;
+    # killing only the direct child would leave those running.
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    await process.wait()
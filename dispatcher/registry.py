@@ -1,12 +1,14 @@
 """Branch registry - maps pod IPs to assigned branches."""
 
 import logging
-from typing import Optional
+import sqlite3
+import threading
+from types import MappingProxyType
+from typing import Mapping, Optional
 
-logger = logging.getLogger(__name__)
+from .config import REGISTRY_PATH
 
-# In-memory registry. Production would use ConfigMap or similar.
-_registry: dict[str, str] = {}
+logger = logging.getLogger(__name__)
 
 
 class AlreadyRegisteredError(Exception):
@@ -14,29 +16,84 @@ class AlreadyRegisteredError(Exception):
     pass
 
 
+def _open_database(path: str) -> sqlite3.Connection:
+    """Open the registry database, creating the schema if needed."""
+    connection = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("CREATE TABLE IF NOT EXISTS pods (ip TEXT PRIMARY KEY, branch TEXT NOT NULL)")
+    return connection
+
+
+# SQLite lets every Uvicorn worker share one registry. Each worker reads from
+# an in-process snapshot that is replaced (never mutated) whenever
+# PRAGMA data_version reports a commit from another connection.
+_connection = _open_database(REGISTRY_PATH)
+_lock = threading.Lock()
+_registry: dict[str, str] = {}
+_registry_version: Optional[int] = None
+
+# Only a file-backed registry can be written by another worker. With the
+# in-memory default, this worker's own writes replace the snapshot, so
+# lookups read it without the lock or a data_version query.
+shared = REGISTRY_PATH != ":memory:"
+
+
+def _refresh() -> dict[str, str]:
+    """Return the current snapshot, reloading it if another worker wrote. Caller holds _lock."""
+    global _registry, _registry_version
+    version = _connection.execute("PRAGMA data_version").fetchone()[0]
+    if version != _registry_version:
+        _registry = dict(_connection.execute("SELECT ip, branch FROM pods"))
+        _registry_version = version
+    return _registry
+
+
+def _reload() -> dict[str, str]:
+    """Replace the snapshot after this worker's own write. Caller holds _lock."""
+    global _registry_version
+    _registry_version = None
+    return _refresh()
+
+
+def _snapshot() -> dict[str, str]:
+    """Get the current snapshot, checking for other workers' writes if the registry is shared."""
+    if not shared:
+        return _registry
+    with _lock:
+        return _refresh()
+
+
 def register(pod_ip: str, branch: str) -> None:
     """Register a pod for a branch. Raises AlreadyRegisteredError if already registered."""
-    if pod_ip in _registry:
-        existing_branch = _registry[pod_ip]
-        logger.warning(f"Pod {pod_ip} attempted re-registration for {branch} (already registered for {existing_branch})")
-        raise AlreadyRegisteredError(f"Pod already registered for branch '{existing_branch}'")
-    _registry[pod_ip] = branch
-    logger.info(f"Registered pod {pod_ip} for branch {branch}")
+    with _lock:
+        try:
+            _connection.execute("INSERT INTO pods (ip, branch) VALUES (?, ?)", (pod_ip, branch))
+        except sqlite3.IntegrityError:
+            existing_branch = _reload().get(pod_ip)
+            logger.warning("Pod %s attempted re-registration for %s (already registered for %s)", pod_ip, branch, existing_branch)
+            raise AlreadyRegisteredError(f"Pod already registered for branch '{existing_branch}'")
+        _reload()
+    logger.info("Registered pod %s for branch %s", pod_ip, branch)
 
 
 def deregister(pod_ip: str) -> Optional[str]:
     """Deregister a pod. Returns the branch it was registered for, or None."""
-    branch = _registry.pop(pod_ip, None)
+    with _lock:
+        row = _connection.execute("DELETE FROM pods WHERE ip = ? RETURNING branch", (pod_ip,)).fetchone()
+        _reload()
+    branch = row[0] if row else None
     if branch:
-        logger.info(f"Deregistered pod {pod_ip} (was branch {branch})")
+        logger.info("Deregistered pod %s (was branch %s)", pod_ip, branch)
     return branch
 
 
 def get_branch(pod_ip: str) -> Optional[str]:
     """Get the branch assigned to a pod, or None if not registered."""
-    return _registry.get(pod_ip)
+    return _snapshot().get(pod_ip)
 
 
-def list_all() -> dict[str, str]:
-    """List all registered pods."""
-    return dict(_registry)
+def list_all() -> Mapping[str, str]:
+    """List all registered pods, as a read-only view of the current snapshot."""
+    # Snapshots are replaced rather than mutated, so the view needs no copy
+    # and never changes under the caller.
+    return MappingProxyType(_snapshot())
@@ -0,0 +1,76 @@
+"""Cached listing of branches on the managed repository's remote.
+
+Pods tend to start in bursts, and each bootstrap asks whether its branch
+exists on the remote. One ls-remote of all heads answers every bootstrap
+in the burst instead of one network round trip each.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from .config import REMOTE_BRANCHES_TTL, REPO_URL, WORKSPACE_ROOT
+from .git import execute_with_auth
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_heads: dict[str, str] = {}
+_listed_at: Optional[float] = None
+
+
+def remote_branch_exists(branch: str) -> bool:
+    """Check if branch exists on the remote repository."""
+    # Only a listed branch is taken from the cache. Another worker may have
+    # pushed the branch since the listing, and a stale "missing" would
+    # start a new local branch that diverges from it, so that answer is
+    # always confirmed with the remote.
+    return branch in _remote_heads() or _remote_has_head(branch)
+
+
+def invalidate() -> None:
+    """Forget the cached listing, e.g. after a push may have created a branch."""
+    global _listed_at
+    with _lock:
+        _listed_at = None
+
+
+def _remote_heads() -> dict[str, str]:
+    """Get branch name -> commit for every head on the remote, listing at most once per TTL."""
+    global _heads, _listed_at
+    # Holding the lock across ls-remote makes concurrent bootstraps wait for
+    # one listing rather than each starting their own.
+    with _lock:
+        if _listed_at is not None and time.monotonic() - _listed_at < REMOTE_BRANCHES_TTL:
+            return _heads
+
+        result = execute_with_auth(["ls-remote", "--heads", REPO_URL], cwd=WORKSPACE_ROOT)
+        if result.exit_code != 0:
+            logger.warning("Failed to list remote branches: %s", result.stderr)
+            return {}
+
+        _heads = _parse_heads(result.stdout)
+        _listed_at = time.monotonic()
+        return _heads
+
+
+def _remote_has_head(branch: str) -> bool:
+    """Ask the remote, without the cache, whether it has branch."""
+    result = execute_with_auth(
+        ["ls-remote", "--exit-code", "--heads", REPO_URL, f"refs/heads/{branch}"],
+        cwd=WORKSPACE_ROOT,
+    )
+    # ls-remote patterns match on trailing path components, so the exact
+    # name is checked in the output as well.
+    return result.exit_code == 0 and branch in _parse_heads(result.stdout)
+
+
+def _parse_heads(ls_remote_output: str) -> dict[str, str]:
+    """Parse `ls-remote --heads` output into branch name -> commit."""
+    heads = {}
+    for line in ls_remote_output.splitlines():
+        sha, _, ref = line.partition("\t")
+        if ref.startswith("refs/heads/"):
+            heads[ref[len("refs/heads/"):]] = sha
+    return heads
@@ -1,19 +1,59 @@
 """HTTP response formatting for command results."""
 
+import functools
+from types import MappingProxyType
+from typing import Mapping
+
 from fastapi.responses import PlainTextResponse
 
+# Shared read-only header mappings for every exit code a process can report,
+# so building a response doesn't allocate and format a fresh header dict.
+_EXIT_CODE_HEADERS = {
+    exit_code: MappingProxyType({"X-Yolo-Cage-Exit-Code": str(exit_code)})
+    for exit_code in range(256)
+}
+
+
+def _exit_code_headers(exit_code: int) -> Mapping[str, str]:
+    """Get the response headers reporting exit_code."""
+    headers = _EXIT_CODE_HEADERS.get(exit_code)
+    if headers is None:
+        return {"X-Yolo-Cage-Exit-Code": str(exit_code)}
+    return headers
+
 
 def denial(message: str) -> PlainTextResponse:
     """Create a denial response with exit code 1."""
     return PlainTextResponse(
         content=message,
-        headers={"X-Yolo-Cage-Exit-Code": "1"},
+        headers=_EXIT_CODE_HEADERS[1],
     )
 
 
-def command_result(output: str, exit_code: int) -> PlainTextResponse:
-    """Create a response with command output and exit code."""
+def policy_denial(message: str) -> PlainTextResponse:
+    """Create a denial response for a message from the command policy tables."""
+    return PlainTextResponse(
+        content=_policy_denial_body(message),
+        headers=_EXIT_CODE_HEADERS[1],
+    )
+
+
+# Policy messages are a small fixed set of constants, and denied commands are
+# the common case for a misbehaving agent, so each body is encoded only once.
+@functools.cache
+def _policy_denial_body(message: str) -> bytes:
+    """Get the encoded response body for a policy message."""
+    return (message + "\n").encode()
+
+
+def command_result(output: bytes, exit_code: int) -> PlainTextResponse:
+    """Create a response with command output and exit code.
+
+    The output is sent in one piece rather than streamed: the exit code goes
+    in a header, which must be sent before the body, and the shims buffer
+    the whole body before printing it anyway.
+    """
     return PlainTextResponse(
         content=output,
-        headers={"X-Yolo-Cage-Exit-Code": str(exit_code)},
+        headers=_exit_code_headers(exit_code),
     )
@@ -0,0 +1,8 @@
+"""Shared limit on agent git and gh commands running at once."""
+
+import asyncio
+
+from .config import SUBPROCESS_CONCURRENCY
+
+# One semaphore for both tools, so SUBPROCESS_CONCURRENCY caps them combined.
+subprocess_slots = asyncio.Semaphore(SUBPROCESS_CONCURRENCY)
@@ -6,7 +6,7 @@ Handles updating existing workspaces (those with a .git directory).
 import logging
 from pathlib import Path
 
-from .git import execute_with_auth, execute
+from .git import execute, execute_with_auth, execute_quiet, get_current_branch
 
 logger = logging.getLogger(__name__)
 
@@ -16,13 +16,17 @@ class SyncError(Exception):
     pass
 
 
-def update_workspace(workspace: Path, branch: str) -> dict:
+def update_workspace(workspace: Path, branch: str, refresh: bool = False) -> dict:
     """
     Update existing git workspace - fetch and ensure on correct branch.
 
+    A workspace already on the branch (the usual case when a pod is
+    rescheduled) is returned as-is without fetching, unless refresh is set.
+
     Args:
         workspace: Directory with existing .git
         branch: Branch to be on
+        refresh: Fetch from origin even if already on the branch
 
     Returns:
         Status dict with workspace, branch, action, cloned keys
@@ -30,71 +34,62 @@ def update_workspace(workspace: Path, branch: str) -> dict:
     Raises:
         SyncError on failure
     """
-    _fetch_origin(workspace)
+    cwd = str(workspace)
+    current = get_current_branch(cwd, is_workspace_root=True)
+    if current != branch or refresh:
+        _fetch_origin(cwd)
 
-    current = _get_current_branch(workspace)
     if current == branch:
         return {
             "status": "success",
-            "workspace": str(workspace),
+            "workspace": cwd,
             "branch": branch,
             "action": "already_on_branch",
             "cloned": False,
         }
 
-    _switch_to_branch(workspace, branch)
+    _switch_to_branch(cwd, branch)
 
     return {
         "status": "success",
-        "workspace": str(workspace),
+        "workspace": cwd,
         "branch": branch,
         "action": "switched_branch",
         "cloned": False,
     }
 
 
-def _fetch_origin(workspace: Path) -> None:
+def _fetch_origin(cwd: str) -> None:
     """Fetch from origin, logging warning on failure."""
-    result = execute_with_auth(["fetch", "origin"], cwd=str(workspace))
+    result = execute_with_auth(["fetch", "origin"], cwd=cwd)
     if result.exit_code != 0:
-        logger.warning(f"Failed to fetch: {result.stderr}")
-
+        logger.warning("Failed to fetch: %s", result.stderr)
 
-def _get_current_branch(workspace: Path) -> str | None:
-    """Get name of current branch, or None if detached/error."""
-    result = execute(["rev-parse", "--abbrev-ref", "HEAD"], cwd=str(workspace))
-    return result.stdout.strip() if result.exit_code == 0 else None
 
+def _switch_to_branch(cwd: str, branch: str) -> None:
+    """Switch to branch, checking local then remote-tracking refs."""
+    # The fetch above already brought origin's branches into
+    # refs/remotes/origin, so no second round trip to the remote is needed.
+    local_ref = f"refs/heads/{branch}"
+    remote_ref = f"refs/remotes/origin/{branch}"
+    refs = _existing_refs(cwd, [local_ref, remote_ref])
 
-def _switch_to_branch(workspace: Path, branch: str) -> None:
-    """Switch to branch, checking local then remote."""
-    if _branch_exists_locally(workspace, branch):
-        result = execute(["checkout", branch], cwd=str(workspace))
-    elif _branch_exists_on_remote(workspace, branch):
-        result = execute(
-            ["checkout", "-b", branch, f"origin/{branch}"],
-            cwd=str(workspace)
-        )
+    if local_ref in refs:
+        result = execute_quiet(["checkout", branch], cwd=cwd)
+    elif remote_ref in refs:
+        result = execute_quiet(["checkout", "-b", branch, f"origin/{branch}"], cwd=cwd)
     else:
-        result = execute(["checkout", "-b", branch], cwd=str(workspace))
+        result = execute_quiet(["checkout", "-b", branch], cwd=cwd)
 
     if result.exit_code != 0:
         raise SyncError(f"Failed to checkout branch {branch}: {result.stderr}")
 
 
-def _branch_exists_locally(workspace: Path, branch: str) -> bool:
-    """Check if branch exists as local ref."""
-    result = execute(
-        ["show-ref", "--verify", f"refs/heads/{branch}"],
-        cwd=str(workspace)
-    )
-    return result.exit_code == 0
-
-
-def _branch_exists_on_remote(workspace: Path, branch: str) -> bool:
-    """Check if branch exists on origin."""
-    result = execute(
-        ["ls-remote", "--heads", "origin", branch],
-        cwd=str(workspace)
-    )
-    return branch in result.stdout
+def _existing_refs(cwd: str, refs: list[str]) -> set[str]:
+    """Return which of the fully qualified refs exist, using one git process."""
+    result = execute(["for-each-ref", "--format=%(refname)", *refs], cwd=cwd)
+    if result.exit_code != 0:
+        return set()
+    # for-each-ref patterns also match refs nested below them
+    # (refs/heads/foo/bar for refs/heads/foo), so keep exact names only.
+    return set(result.stdout.splitlines()) & set(refs)
@@ -0,0 +1,29 @@
+"""Shared fixtures for dispatcher tests."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def fake_process():
+    """Build stand-ins for an asyncio subprocess."""
+    def build(returncode=0, stdout=b"", stderr=b""):
+        process = MagicMock()
+        process.returncode = returncode
+        process.communicate = AsyncMock(return_value=(stdout, stderr))
+        process.wait = AsyncMock(return_value=returncode)
+        return process
+    return build
+
+
+@pytest.fixture
+def hanging_process(fake_process):
+    """A stand-in for a subprocess that never finishes."""
+    async def never_finish():
+        await asyncio.Event().wait()
+
+    process = fake_process()
+    process.communicate = AsyncMock(side_effect=never_finish)
+    return process
@@ -15,9 +15,9 @@ def client():
     return TestClient(app)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def registered_pod():
-    """Register a test pod and clean up after."""
+    """Register the test client's pod once for the module and clean up after."""
     from dispatcher import registry
     test_ip = "testclient"
     registry.register(test_ip, "feature-branch")
@@ -25,70 +25,98 @@ def registered_pod():
     registry.deregister(test_ip)
 
 
+@pytest.fixture
+def unregistered_pod():
+    """Make sure the test client's pod is unregistered, restoring any registration after."""
+    from dispatcher import registry
+    test_ip = "testclient"
+    branch = registry.deregister(test_ip)
+    yield test_ip
+    if branch:
+        registry.register(test_ip, branch)
+
+
 class TestGhEndpointUnregistered:
     """Tests for unregistered pods."""
 
-    def test_unregistered_pod_denied(self, client):
+    def test_unregistered_pod_denied(self, client, unregistered_pod):
         """Unregistered pods should be denied."""
-        # Clear any existing registration
-        from dispatcher import registry
-        registry.deregister("testclient")
-
         response = client.post(
             "/gh",
-            json={"args": ["status"], "cwd": "/workspace"},
+            json={"args": ["status"], "cwd": "/home/dev/workspace"},
         )
         assert response.status_code == 403
         assert "not registered" in response.text
 
+    def test_repeated_rejections_are_logged_once(self, client, unregistered_pod, caplog, monkeypatch):
+        """A pod retrying in a loop is rejected every time but logged once."""
+        monkeypatch.setattr("dispatcher.app._unregistered_logged_at", {})
+
+        responses = [
+            client.post("/gh", json={"args": ["status"], "cwd": "/home/dev/workspace"})
+            for _ in range(3)
+        ]
+
+        assert [response.status_code for response in responses] == [403, 403, 403]
+        assert caplog.text.count("Unregistered pod testclient") == 1
+
+    def test_expired_rejection_entries_are_pruned(self, client, unregistered_pod, monkeypatch):
+        """Pods that stopped retrying don't stay in the rate-limit table."""
+        logged_at = {"10.0.0.1": 0.0}
+        monkeypatch.setattr("dispatcher.app._unregistered_logged_at", logged_at)
+
+        client.post("/gh", json={"args": ["status"], "cwd": "/home/dev/workspace"})
+
+        assert list(logged_at) == ["testclient"]
+
 
 class TestGhEndpointAllowed:
     """Tests for allowed gh commands."""
 
-    @patch("dispatcher.app.gh_execute")
+    @patch("dispatcher.handlers.gh.gh_execute")
     def test_allowed_command_executes(self, mock_execute, client, registered_pod):
         """Allowed commands should be executed."""
         mock_execute.return_value = GhResult(
             exit_code=0,
-            stdout="issue list output",
-            stderr="",
+            stdout=b"issue list output",
+            stderr=b"",
         )
         response = client.post(
             "/gh",
-            json={"args": ["issue", "list"], "cwd": "/workspace"},
+            json={"args": ["issue", "list"], "cwd": "/home/dev/workspace"},
         )
         assert response.status_code == 200
         assert "issue list output" in response.text
         assert response.headers.get("X-Yolo-Cage-Exit-Code") == "0"
-        mock_execute.assert_called_once_with(["issue", "list"], "/workspace")
+        mock_execute.assert_called_once_with(["issue", "list"], "/workspaces/feature-branch")
 
-    @patch("dispatcher.app.gh_execute")
+    @patch("dispatcher.handlers.gh.gh_execute")
     def test_pr_create_allowed(self, mock_execute, client, registered_pod):
         """PR create should be allowed."""
         mock_execute.return_value = GhResult(
             exit_code=0,
-            stdout="https://github.com/owner/repo/pull/123",
-            stderr="",
+            stdout=b"https://github.com/owner/repo/pull/123",
+            stderr=b"",
         )
         response = client.post(
             "/gh",
-            json={"args": ["pr", "create", "--title", "Test PR"], "cwd": "/workspace"},
+            json={"args": ["pr", "create", "--title", "Test PR"], "cwd": "/home/dev/workspace"},
         )
         assert response.status_code == 200
         assert "pull/123" in response.text
         assert response.headers.get("X-Yolo-Cage-Exit-Code") == "0"
 
-    @patch("dispatcher.app.gh_execute")
+    @patch("dispatcher.handlers.gh.gh_execute")
     def test_pr_view_allowed(self, mock_execute, client, registered_pod):
         """PR view should be allowed."""
         mock_execute.return_value = GhResult(
             exit_code=0,
-            stdout="PR details here",
-            stderr="",
+            stdout=b"PR details here",
+            stderr=b"",
         )
         response = client.post(
             "/gh",
-            json={"args": ["pr", "view", "123"], "cwd": "/workspace"},
+            json={"args": ["pr", "view", "123"], "cwd": "/home/dev/workspace"},
         )
         assert response.status_code == 200
         assert response.headers.get("X-Yolo-Cage-Exit-Code") == "0"
@@ -101,7 +129,7 @@ class TestGhEndpointBlocked:
         """PR merge should be blocked."""
         response = client.post(
             "/gh",
-            json={"args": ["pr", "merge", "123"], "cwd": "/workspace"},
+            json={"args": ["pr", "merge", "123"], "cwd": "/home/dev/workspace"},
         )
         assert response.status_code == 200
         assert "merging PRs is not permitted" in response.text
@@ -111,7 +139,7 @@ class TestGhEndpointBlocked:
         """Repo delete should be blocked."""
         response = client.post(
             "/gh",
-            json={"args": ["repo", "delete", "owner/repo"], "cwd": "/workspace"},
+            json={"args": ["repo", "delete", "owner/repo"], "cwd": "/home/dev/workspace"},
         )
         assert response.status_code == 200
         assert "deleting repositories is not permitted" in response.text
@@ -121,7 +149,7 @@ class TestGhEndpointBlocked:
         """Direct API access should be blocked."""
         response = client.post(
             "/gh",
-            json={"args": ["api", "/repos/owner/repo"], "cwd": "/workspace"},
+            json={"args": ["api", "/repos/owner/repo"], "cwd": "/home/dev/workspace"},
         )
         assert response.status_code == 200
         assert "direct API access is not permitted" in response.text
@@ -131,7 +159,7 @@ class TestGhEndpointBlocked:
         """Auth operations should be blocked."""
         response = client.post(
             "/gh",
-            json={"args": ["auth", "login"], "cwd": "/workspace"},
+            json={"args": ["auth", "login"], "cwd": "/home/dev/workspace"},
         )
         assert response.status_code == 200
         assert "authentication is managed by the sandbox" in response.text
@@ -141,7 +169,7 @@ class TestGhEndpointBlocked:
         """Secret operations should be blocked."""
         response = client.post(
             "/gh",
-            json={"args": ["secret", "set", "MY_SECRET"], "cwd": "/workspace"},
+            json={"args": ["secret", "set", "MY_SECRET"], "cwd": "/home/dev/workspace"},
         )
         assert response.status_code == 200
         assert "managing secrets is not permitted" in response.text
@@ -155,7 +183,7 @@ class TestGhEndpointUnknown:
         """Unknown commands should be blocked."""
         response = client.post(
             "/gh",
-            json={"args": ["unknown-command"], "cwd": "/workspace"},
+            json={"args": ["unknown-command"], "cwd": "/home/dev/workspace"},
         )
         assert response.status_code == 200
         assert "unrecognized or disallowed gh operation" in response.text
@@ -165,7 +193,7 @@ class TestGhEndpointUnknown:
         """Empty args should be blocked."""
         response = client.post(
             "/gh",
-            json={"args": [], "cwd": "/workspace"},
+            json={"args": [], "cwd": "/home/dev/workspace"},
         )
         assert response.status_code == 200
         assert "unrecognized or disallowed gh operation" in response.text
@@ -175,17 +203,17 @@ class TestGhEndpointUnknown:
 class TestGhEndpointExecutionErrors:
     """Tests for execution error handling."""
 
-    @patch("dispatcher.app.gh_execute")
+    @patch("dispatcher.handlers.gh.gh_execute")
     def test_command_returns_nonzero_exit(self, mock_execute, client, registered_pod):
         """Non-zero exit codes should be passed through."""
         mock_execute.return_value = GhResult(
             exit_code=1,
-            stdout="",
-            stderr="gh: Not Found",
+            stdout=b"",
+            stderr=b"gh: Not Found",
         )
         response = client.post(
             "/gh",
-            json={"args": ["repo", "view", "nonexistent/repo"], "cwd": "/workspace"},
+            json={"args": ["repo", "view", "nonexistent/repo"], "cwd": "/home/dev/workspace"},
         )
         assert response.status_code == 200
         assert "Not Found" in response.text
@@ -1,11 +1,14 @@
 """Tests for workspace bootstrap orchestration."""
 
+import fcntl
+import threading
+import time
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from dispatcher.bootstrap import bootstrap_workspace, BootstrapError
+from dispatcher.bootstrap import bootstrap_workspace, _workspace_lock_path, BootstrapError
 
 
 class TestBootstrapWorkspace:
@@ -56,7 +59,7 @@ class TestBootstrapWorkspace:
                     mock_update.return_value = {"status": "success", "action": "updated"}
                     result = bootstrap_workspace("test-branch")
 
-        mock_update.assert_called_once_with(workspace, "test-branch")
+        mock_update.assert_called_once_with(workspace, "test-branch", refresh=False)
         assert result["action"] == "updated"
 
     def test_raises_error_for_files_without_git(self, tmp_path):
@@ -71,3 +74,95 @@ class TestBootstrapWorkspace:
                     bootstrap_workspace("test-branch")
                 assert "has files but no .git directory" in str(exc.value)
                 assert "corrupted or manually modified" in str(exc.value)
+
+    def test_concurrent_bootstraps_of_one_branch_clone_once(self, tmp_path):
+        """A second bootstrap of the same branch waits and then sees the clone."""
+        def slow_clone(workspace, branch):
+            time.sleep(0.05)
+            (workspace / ".git").mkdir()
+            return {"status": "success", "action": "cloned"}
+
+        with patch("dispatcher.bootstrap.WORKSPACE_ROOT", str(tmp_path)):
+            with patch("dispatcher.bootstrap.REPO_URL", "https://github.com/test/repo.git"):
+                with patch("dispatcher.bootstrap.clone_and_checkout", side_effect=slow_clone) as mock_clone:
+                    with patch("dispatcher.bootstrap.update_workspace") as mock_update:
+                        mock_update.return_value = {"status": "success", "action": "updated"}
+                        threads = [
+                            threading.Thread(target=bootstrap_workspace, args=("test-branch",))
+                            for _ in range(2)
+                        ]
+                        for thread in threads:
+                            thread.start()
+                        for thread in threads:
+                            thread.join()
+
+        assert mock_clone.call_count == 1
+        assert mock_update.call_count == 1
+
+    def test_bootstrap_waits_for_another_workers_lock(self, tmp_path):
+        """The per-branch lock is a file lock, so it also holds across worker processes."""
+        lock_dir = tmp_path / ".bootstrap-locks"
+        lock_dir.mkdir()
+
+        with patch("dispatcher.bootstrap.WORKSPACE_ROOT", str(tmp_path)):
+            with patch("dispatcher.bootstrap.REPO_URL", "https://github.com/test/repo.git"):
+                with patch("dispatcher.bootstrap.clone_and_checkout") as mock_clone:
+                    with open(_workspace_lock_path("feature/x"), "w") as other_worker:
+                        fcntl.flock(other_worker, fcntl.LOCK_EX)
+                        thread = threading.Thread(target=bootstrap_workspace, args=("feature/x",))
+                        thread.start()
+                        time.sleep(0.05)
+                        assert mock_clone.call_count == 0
+                    thread.join()
+
+        assert mock_clone.call_count == 1
+
+    def test_bootstrap_long_branch_with_slash(self, tmp_path):
+        """A branch whose quoted name would exceed NAME_MAX still gets a lock file."""
+        branch = "feature/" + "a" * 250
+
+        with patch("dispatcher.bootstrap.WORKSPACE_ROOT", str(tmp_path)):
+            with patch("dispatcher.bootstrap.REPO_URL", "https://github.com/test/repo.git"):
+                with patch("dispatcher.bootstrap.clone_and_checkout") as mock_clone:
+                    mock_clone.return_value = {"status": "success"}
+                    bootstrap_workspace(branch)
+
+        mock_clone.assert_called_once_with(tmp_path / branch, branch)
+
+    def test_bootstrap_after_delete_pod_waits_for_running_one(self, tmp_path):
+        """delete_pod leaves the lock file, so a later bootstrap still waits."""
+        from dispatcher import pods
+
+        release = threading.Event()
+        active = []
+        overlapped = []
+
+        def slow_clone(workspace, branch):
+            overlapped.append(bool(active))
+            active.append(branch)
+            release.wait(timeout=5)
+            active.remove(branch)
+            return {"status": "success", "action": "cloned"}
+
+        with patch("dispatcher.bootstrap.WORKSPACE_ROOT", str(tmp_path)):
+            with patch("dispatcher.pods.WORKSPACE_ROOT", str(tmp_path)):
+                with patch("dispatcher.pods._init_k8s_client"):
+                    with patch("dispatcher.bootstrap.REPO_URL", "https://github.com/test/repo.git"):
+                        with patch("dispatcher.bootstrap.clone_and_checkout", side_effect=slow_clone) as mock_clone:
+                            first = threading.Thread(target=bootstrap_workspace, args=("feature/x",))
+                            first.start()
+                            time.sleep(0.05)
+
+                            pods.delete_pod("feature/x", clean_workspace=True)
+
+                            second = threading.Thread(target=bootstrap_workspace, args=("feature/x",))
+                            second.start()
+                            time.sleep(0.05)
+                            assert mock_clone.call_count == 1
+
+                            release.set()
+                            first.join()
+                            second.join()
+
+        assert mock_clone.call_count == 2
+        assert overlapped == [False, False]
@@ -12,61 +12,128 @@ from dispatcher.models import GitResult
 class TestCloneAndCheckout:
     """Tests for clone_and_checkout function."""
 
-    def test_clone_and_checkout_existing_branch(self, tmp_path):
-        """Successfully clone and checkout existing branch."""
+    @patch("dispatcher.clone.remote_branch_exists", return_value=True)
+    def test_clone_and_checkout_existing_branch(self, mock_exists, tmp_path):
+        """Existing remote branch is cloned directly, without a separate checkout."""
         workspace = tmp_path / "test-branch"
         workspace.mkdir()
+        clone_calls = []
 
         def mock_execute_with_auth(args, cwd):
             if args[0] == "clone":
+                clone_calls.append(args)
                 (workspace / ".git").mkdir()
                 return GitResult(0, "Cloning...", "")
             return GitResult(0, "", "")
 
         def mock_execute(args, cwd):
-            if args[0] == "ls-remote":
-                return GitResult(0, "abc123\trefs/heads/test-branch", "")
-            if args[0] == "checkout":
-                return GitResult(0, "", "")
-            return GitResult(0, "", "")
+            raise AssertionError(f"unexpected git {args}")
 
         with patch("dispatcher.clone.REPO_URL", "https://github.com/test/repo.git"):
             with patch("dispatcher.clone.execute_with_auth", mock_execute_with_auth):
-                with patch("dispatcher.clone.execute", mock_execute):
+                with patch("dispatcher.clone.execute_quiet", mock_execute):
                     result = clone_and_checkout(workspace, "test-branch")
 
         assert result["status"] == "success"
         assert result["action"] == "checked_out"
         assert result["cloned"] is True
+        assert clone_calls[0][1:3] == ["--branch", "test-branch"]
 
-    def test_clone_and_create_new_branch(self, tmp_path):
+    @patch("dispatcher.clone.remote_branch_exists", return_value=False)
+    def test_clone_and_create_new_branch(self, mock_exists, tmp_path):
         """Successfully clone and create new branch when it doesn't exist."""
         workspace = tmp_path / "feature-new"
         workspace.mkdir()
 
         def mock_execute_with_auth(args, cwd):
             if args[0] == "clone":
+                assert "--branch" not in args
                 (workspace / ".git").mkdir()
                 return GitResult(0, "Cloning...", "")
             return GitResult(0, "", "")
 
         def mock_execute(args, cwd):
-            if args[0] == "ls-remote":
-                return GitResult(0, "", "")  # Branch doesn't exist
             if args[0] == "checkout" and "-b" in args:
                 return GitResult(0, "", "")
             return GitResult(0, "", "")
 
         with patch("dispatcher.clone.REPO_URL", "https://github.com/test/repo.git"):
             with patch("dispatcher.clone.execute_with_auth", mock_execute_with_auth):
-                with patch("dispatcher.clone.execute", mock_execute):
+                with patch("dispatcher.clone.execute_quiet", mock_execute):
                     result = clone_and_checkout(workspace, "feature-new")
 
         assert result["status"] == "success"
         assert result["action"] == "created"
         assert result["cloned"] is True
 
-    def test_clone_failure_raises_error(self, tmp_path):
+    @patch("dispatcher.clone.remote_branch_exists", return_value=True)
+    def test_clone_filter_is_passed_to_clone(self, mock_exists, tmp_path):
+        """A configured partial clone filter is applied to the clone."""
+        workspace = tmp_path / "test-branch"
+        workspace.mkdir()
+        clone_calls = []
+
+        def mock_execute_with_auth(args, cwd):
+            if args[0] == "clone":
+                clone_calls.append(args)
+            return GitResult(exit_code=0, stdout="", stderr="")
+
+        with patch("dispatcher.clone.REPO_URL", "https://github.com/test/repo.git"):
+            with patch("dispatcher.clone.CLONE_FILTER", "blob:none"):
+                with patch("dispatcher.clone.execute_with_auth", mock_execute_with_auth):
+                    with patch("dispatcher.clone.execute_quiet", lambda args, cwd: GitResult(exit_code=0, stdout="", stderr="")):
+                        clone_and_checkout(workspace, "test-branch")
+
+        assert "--filter=blob:none" in clone_calls[0]
+
+    @patch("dispatcher.clone.remote_branch_exists", return_value=True)
+    def test_shallow_bootstrap_clones_only_the_branch_tip(self, mock_exists, tmp_path):
+        """Shallow bootstrap clones one commit of the branch, without tags."""
+        workspace = tmp_path / "test-branch"
+        workspace.mkdir()
+        clone_calls = []
+
+        def mock_execute_with_auth(args, cwd):
+            if args[0] == "clone":
+                clone_calls.append(args)
+            return GitResult(0, "", "")
+
+        with patch("dispatcher.clone.REPO_URL", "https://github.com/test/repo.git"):
+            with patch("dispatcher.clone.SHALLOW_BOOTSTRAP", True):
+                with patch("dispatcher.clone.execute_with_auth", mock_execute_with_auth):
+                    clone_and_checkout(workspace, "test-branch")
+
+        assert clone_calls[0] == [
+            "clone", "--depth=1", "--single-branch", "--no-tags",
+            "--branch", "test-branch",
+            "https://github.com/test/repo.git", str(workspace),
+        ]
+
+    @patch("dispatcher.clone.reference_mirror", return_value="/workspaces/.mirror")
+    @patch("dispatcher.clone.remote_branch_exists", return_value=True)
+    def test_clone_uses_reference_mirror(self, mock_exists, mock_mirror, tmp_path):
+        """Clones borrow objects from the mirror, then copy them in."""
+        workspace = tmp_path / "test-branch"
+        workspace.mkdir()
+        clone_calls = []
+
+        def mock_execute_with_auth(args, cwd):
+            if args[0] == "clone":
+                clone_calls.append(args)
+            return GitResult(0, "", "")
+
+        with patch("dispatcher.clone.REPO_URL", "https://github.com/test/repo.git"):
+            with patch("dispatcher.clone.execute_with_auth", mock_execute_with_auth):
+                clone_and_checkout(workspace, "test-branch")
+
+        assert clone_calls[0] == [
+            "clone", "--branch", "test-branch",
+            "--reference-if-able", "/workspaces/.mirror", "--dissociate",
+            "https://github.com/test/repo.git", str(workspace),
+        ]
+
+    @patch("dispatcher.clone.remote_branch_exists", return_value=True)
+    def test_clone_failure_raises_error(self, mock_exists, tmp_path):
         """Clone failure raises CloneError."""
         workspace = tmp_path / "test-branch"
         workspace.mkdir()
@@ -80,8 +147,9 @@ class TestCloneAndCheckout:
                     clone_and_checkout(workspace, "test-branch")
                 assert "Failed to clone" in str(exc.value)
 
-    def test_checkout_failure_raises_error(self, tmp_path):
-        """Checkout failure after successful clone raises CloneError."""
+    @patch("dispatcher.clone.remote_branch_exists", return_value=False)
+    def test_checkout_failure_raises_error(self, mock_exists, tmp_path):
+        """Branch creation failure after successful clone raises CloneError."""
         workspace = tmp_path / "test-branch"
         workspace.mkdir()
 
@@ -92,15 +160,13 @@ class TestCloneAndCheckout:
             return GitResult(0, "", "")
 
         def mock_execute(args, cwd):
-            if args[0] == "ls-remote":
-                return GitResult(0, "abc123\trefs/heads/test-branch", "")
             if args[0] == "checkout":
-                return GitResult(1, "", "error: pathspec 'test-branch' did not match")
+                return GitResult(128, "", "fatal: 'test-branch' is not a valid branch name")
             return GitResult(0, "", "")
 
         with patch("dispatcher.clone.REPO_URL", "https://github.com/test/repo.git"):
             with patch("dispatcher.clone.execute_with_auth", mock_execute_with_auth):
-                with patch("dispatcher.clone.execute", mock_execute):
+                with patch("dispatcher.clone.execute_quiet", mock_execute):
                     with pytest.raises(CloneError) as exc:
                         clone_and_checkout(workspace, "test-branch")
-                    assert "Failed to checkout" in str(exc.value)
+                    assert "Failed to create branch" in str(exc.value)
@@ -25,10 +25,11 @@ class TestGetSubcommand:
         assert get_subcommand(["commit", "-m", "message"]) == "commit"
 
     def test_command_with_flags_first(self):
-        # Note: Current implementation doesn't handle -C /path style flags
-        # It treats /path as the subcommand. This is a known limitation.
-        # In practice, the git shim doesn't use these flags.
+        # Deliberate: an option's value is taken as the subcommand, so -C
+        # (another workspace) and -c (config, aliases) end up UNKNOWN and
+        # denied rather than skipped over to a permitted subcommand.
         assert get_subcommand(["-C", "/path", "status"]) == "/path"
+        assert get_subcommand(["-c", "alias.status=!sh", "status"]) == "alias.status=!sh"
 
     def test_empty_args(self):
         assert get_subcommand([]) is None
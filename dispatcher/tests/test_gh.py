@@ -1,14 +1,24 @@
 """Tests for GitHub CLI execution module."""
 
+import asyncio
+import signal
+
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock
 
-from dispatcher.gh import execute, _base_env
+from dispatcher.gh import execute, _base_env, _GH
 
 
 class TestBaseEnv:
     """Tests for environment setup."""
 
+    @pytest.fixture(autouse=True)
+    def rebuild_env(self):
+        """Build the cached environment from each test's patched token."""
+        _base_env.cache_clear()
+        yield
+        _base_env.cache_clear()
+
     @patch("dispatcher.gh.GITHUB_PAT", "test-token")
     def test_sets_github_token_when_available(self):
         env = _base_env()
@@ -22,61 +32,83 @@ class TestBaseEnv:
         assert "GITHUB_TOKEN" not in env or env.get("GITHUB_TOKEN") is None
         assert env["GH_PROMPT_DISABLED"] == "1"
 
+    @patch("dispatcher.gh.GITHUB_PAT", "test-token")
+    def test_environment_is_built_once(self):
+        assert _base_env() is _base_env()
+
 
 class TestExecute:
     """Tests for gh command execution."""
 
-    @patch("dispatcher.gh.subprocess.run")
+    @patch("dispatcher.gh.start_process", new_callable=AsyncMock)
     @patch("dispatcher.gh.GITHUB_PAT", "test-token")
-    def test_successful_command(self, mock_run):
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="output",
-            stderr="",
-        )
-        result = execute(["issue", "list"], "/workspace")
+    def test_successful_command(self, mock_spawn, fake_process):
+        mock_spawn.return_value = fake_process(stdout=b"output")
+        result = asyncio.run(execute(["issue", "list"], "/workspace"))
         assert result.exit_code == 0
-        assert result.stdout == "output"
-        assert result.stderr == ""
-        mock_run.assert_called_once()
+        assert result.stdout == b"output"
+        assert result.stderr == b""
+        mock_spawn.assert_called_once()
         # Verify gh was called with correct args
-        call_args = mock_run.call_args
-        assert call_args[0][0] == ["gh", "issue", "list"]
+        call_args = mock_spawn.call_args
+        assert call_args[0] == (_GH, "issue", "list")
         assert call_args[1]["cwd"] == "/workspace"
 
-    @patch("dispatcher.gh.subprocess.run")
+    @patch("dispatcher.gh.start_process", new_callable=AsyncMock)
     @patch("dispatcher.gh.GITHUB_PAT", "test-token")
-    def test_command_with_error(self, mock_run):
-        mock_run.return_value = MagicMock(
-            returncode=1,
-            stdout="",
-            stderr="error message",
-        )
-        result = execute(["repo", "view", "nonexistent"], "/workspace")
+    def test_command_with_error(self, mock_spawn, fake_process):
+        mock_spawn.return_value = fake_process(returncode=1, stderr=b"error message")
+        result = asyncio.run(execute(["repo", "view", "nonexistent"], "/workspace"))
         assert result.exit_code == 1
-        assert result.stderr == "error message"
+        assert result.stderr == b"error message"
 
-    @patch("dispatcher.gh.subprocess.run")
+    @patch("dispatcher.processes.os.killpg")
+    @patch("dispatcher.gh._TIMEOUT_SECONDS", 0.01)
+    @patch("dispatcher.gh.start_process", new_callable=AsyncMock)
     @patch("dispatcher.gh.GITHUB_PAT", "test-token")
-    def test_timeout(self, mock_run):
-        import subprocess
-        mock_run.side_effect = subprocess.TimeoutExpired(cmd="gh", timeout=300)
-        result = execute(["issue", "list"], "/workspace")
+    def test_timeout(self, mock_spawn, mock_killpg, hanging_process):
+        process = hanging_process
+        mock_spawn.return_value = process
+        result = asyncio.run(execute(["issue", "list"], "/workspace"))
         assert result.exit_code == 1
-        assert "timed out" in result.stderr
+        assert b"timed out" in result.stderr
+        mock_killpg.assert_called_once_with(process.pid, signal.SIGKILL)
+        process.wait.assert_awaited_once()
 
-    @patch("dispatcher.gh.subprocess.run")
+    @patch("dispatcher.processes.os.killpg")
+    @patch("dispatcher.gh.start_process", new_callable=AsyncMock)
     @patch("dispatcher.gh.GITHUB_PAT", "test-token")
-    def test_gh_not_found(self, mock_run):
-        mock_run.side_effect = FileNotFoundError()
-        result = execute(["status"], "/workspace")
+    def test_cancelled_command_is_killed(self, mock_spawn, mock_killpg, hanging_process):
+        process = hanging_process
+        mock_spawn.return_value = process
+
+        async def cancel_mid_command():
+            task = asyncio.create_task(execute(["issue", "list"], "/workspace"))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_mid_command())
+        mock_killpg.assert_called_once_with(process.pid, signal.SIGKILL)
+        process.wait.assert_awaited_once()
+
+    @patch("dispatcher.gh.start_process", new_callable=AsyncMock)
+    @patch("dispatcher.gh.GITHUB_PAT", "test-token")
+    def test_gh_not_found(self, mock_spawn):
+        mock_spawn.side_effect = FileNotFoundError()
+        result = asyncio.run(execute(["status"], "/workspace"))
         assert result.exit_code == 1
-        assert "not installed" in result.stderr
+        assert b"not installed" in result.stderr
 
-    @patch("dispatcher.gh.subprocess.run")
+    @patch("dispatcher.gh.start_process", new_callable=AsyncMock)
     @patch("dispatcher.gh.GITHUB_PAT", "test-token")
-    def test_generic_exception(self, mock_run):
-        mock_run.side_effect = Exception("something went wrong")
-        result = execute(["status"], "/workspace")
+    def test_generic_exception(self, mock_spawn):
+        mock_spawn.side_effect = Exception("something went wrong")
+        result = asyncio.run(execute(["status"], "/workspace"))
         assert result.exit_code == 1
-        assert "failed to execute gh" in result.stderr
+        assert b"failed to execute gh" in result.stderr
+
+    def test_shares_subprocess_limit_with_git(self):
+        from dispatcher import gh, git
+        assert gh.subprocess_slots is git.subprocess_slots
@@ -0,0 +1,123 @@
+"""Tests for git execution helpers."""
+
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from dispatcher.config import FETCH_JOBS
+from dispatcher.git import _auth_env, _base_env, execute_quiet, get_current_branch
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """A repository with one commit on branch 'feature'."""
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+    git("init", "-b", "feature")
+    git("-c", "user.name=test", "-c", "user.email=test@localhost", "commit", "--allow-empty", "-m", "initial")
+    return tmp_path
+
+
+class TestGetCurrentBranch:
+    """Tests for get_current_branch."""
+
+    def test_returns_checked_out_branch(self, repository):
+        assert get_current_branch(str(repository)) == "feature"
+
+    def test_detached_head_has_no_branch(self, repository):
+        subprocess.run(["git", "checkout", "--detach"], cwd=repository, check=True, capture_output=True)
+        assert get_current_branch(str(repository)) is None
+
+    def test_subdirectory_resolves_to_repository_branch(self, repository):
+        subdirectory = repository / "src"
+        subdirectory.mkdir()
+        assert get_current_branch(str(subdirectory)) == "feature"
+
+    def test_missing_directory_has_no_branch(self, tmp_path):
+        assert get_current_branch(str(tmp_path / "missing")) is None
+
+    def test_workspace_root_reads_head_without_git(self, repository):
+        with patch("dispatcher.git.subprocess.run") as run:
+            assert get_current_branch(str(repository), is_workspace_root=True) == "feature"
+        run.assert_not_called()
+
+    def test_planted_head_below_workspace_root_is_ignored(self, repository):
+        """A fake .git/HEAD in a subdirectory can't spoof the branch git will push."""
+        planted = repository / "x" / ".git"
+        planted.mkdir(parents=True)
+        (planted / "HEAD").write_text("ref: refs/heads/assigned\n")
+        assert get_current_branch(str(repository / "x")) == "feature"
+
+
+class TestExecuteQuiet:
+    """Tests for execute_quiet."""
+
+    def test_success_reports_exit_code_only(self, repository):
+        result = execute_quiet(["rev-parse", "--verify", "--quiet", "refs/heads/feature"], str(repository))
+        assert result.exit_code == 0
+        assert result.stdout == ""
+
+    def test_failure_keeps_stderr(self, repository):
+        result = execute_quiet(["checkout", "missing"], str(repository))
+        assert result.exit_code != 0
+        assert "missing" in result.stderr
+
+
+class TestBaseEnv:
+    """Tests for the environment git commands run with."""
+
+    def test_uses_protocol_version_2(self, tmp_path):
+        result = subprocess.run(
+            ["git", "config", "protocol.version"],
+            cwd=tmp_path, env=_base_env(), capture_output=True, text=True,
+        )
+        assert result.stdout.strip() == "2"
+
+    def test_trusts_any_directory(self, tmp_path):
+        result = subprocess.run(
+            ["git", "config", "safe.directory"],
+            cwd=tmp_path, env=_base_env(), capture_output=True, text=True,
+        )
+        assert result.stdout.strip() == "*"
+
+    def test_fetches_in_parallel(self, tmp_path):
+        result = subprocess.run(
+            ["git", "config", "fetch.parallel"],
+            cwd=tmp_path, env=_base_env(), capture_output=True, text=True,
+        )
+        assert result.stdout.strip() == str(FETCH_JOBS)
+
+
+def _credential_fill(env: dict) -> str:
+    """Ask git for github.com credentials the way a push would."""
+    return subprocess.run(
+        ["git", "credential", "fill"],
+        input="protocol=https\nhost=github.com\n\n",
+        env=env, capture_output=True, text=True,
+    ).stdout
+
+
+class TestAuthEnv:
+    """Tests for the authenticated git environment."""
+
+    @pytest.fixture(autouse=True)
+    def rebuild_env(self):
+        """Build the cached environment from each test's patched token."""
+        _auth_env.cache_clear()
+        yield
+        _auth_env.cache_clear()
+
+    def test_credential_helper_supplies_token(self):
+        with patch("dispatcher.git.GITHUB_PAT", "test-token"):
+            env = _auth_env()
+        assert "password=test-token" in _credential_fill(env)
+
+    def test_without_token_no_credentials_are_supplied(self):
+        with patch("dispatcher.git.GITHUB_PAT", ""):
+            env = _auth_env()
+        assert "password=" not in _credential_fill(env)
+
+    def test_environment_is_built_once(self):
+        with patch("dispatcher.git.GITHUB_PAT", "test-token"):
+            assert _auth_env() is _auth_env()
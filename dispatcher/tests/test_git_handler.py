@@ -0,0 +1,11 @@
+"""Tests for git command dispatch."""
+
+from dispatcher.commands import CommandCategory
+from dispatcher.handlers.git import _HANDLERS
+
+
+class TestGitHandlerDispatch:
+    """Tests for the category dispatch table."""
+
+    def test_every_category_has_a_handler(self):
+        assert set(_HANDLERS) == set(CommandCategory)
@@ -1,76 +1,81 @@
 """Tests for pre-push hook execution."""
 
+import asyncio
+import importlib
+import signal
+import time
+
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock
 
-from dispatcher.hooks import HookResult, _run_single_hook, run_pre_push_hooks
+from dispatcher.hooks import HookBatcher, HookResult, _run_single_hook, run_pre_push_hooks
 
 
 class TestRunSingleHook:
     """Tests for single hook execution."""
 
-    @patch("dispatcher.hooks.subprocess.run")
-    def test_successful_hook(self, mock_run):
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="Hook passed\n",
-            stderr="",
-        )
-        result = _run_single_hook("echo test", "/workspace")
+    @patch("dispatcher.hooks.start_shell", new_callable=AsyncMock)
+    def test_successful_hook(self, mock_spawn, fake_process):
+        mock_spawn.return_value = fake_process(stdout=b"Hook passed\n")
+        result = asyncio.run(_run_single_hook("echo test", "/workspace"))
 
         assert result.success is True
         assert "Hook passed" in result.output
         assert result.hook_cmd == "echo test"
 
-    @patch("dispatcher.hooks.subprocess.run")
-    def test_failed_hook(self, mock_run):
-        mock_run.return_value = MagicMock(
-            returncode=1,
-            stdout="",
-            stderr="Hook failed\n",
-        )
-        result = _run_single_hook("false", "/workspace")
+    @patch("dispatcher.hooks.start_shell", new_callable=AsyncMock)
+    def test_failed_hook(self, mock_spawn, fake_process):
+        mock_spawn.return_value = fake_process(returncode=1, stderr=b"Hook failed\n")
+        result = asyncio.run(_run_single_hook("false", "/workspace"))
 
         assert result.success is False
         assert "Hook failed" in result.output
 
-    @patch("dispatcher.hooks.subprocess.run")
-    def test_hook_timeout(self, mock_run):
-        import subprocess
-        mock_run.side_effect = subprocess.TimeoutExpired(cmd="slow", timeout=120)
+    @patch("dispatcher.processes.os.killpg")
+    @patch("dispatcher.hooks._TIMEOUT_SECONDS", 0.01)
+    @patch("dispatcher.hooks.start_shell", new_callable=AsyncMock)
+    def test_hook_timeout(self, mock_spawn, mock_killpg, hanging_process):
+        process = hanging_process
+        mock_spawn.return_value = process
 
-        result = _run_single_hook("sleep 1000", "/workspace")
+        result = asyncio.run(_run_single_hook("sleep 1000", "/workspace"))
 
         assert result.success is False
         assert "timed out" in result.output
+        mock_killpg.assert_called_once_with(process.pid, signal.SIGKILL)
 
-    @patch("dispatcher.hooks.subprocess.run")
-    def test_hook_exception(self, mock_run):
-        mock_run.side_effect = Exception("Unexpected error")
+    @patch("dispatcher.hooks.start_shell", new_callable=AsyncMock)
+    def test_hook_exception(self, mock_spawn):
+        mock_spawn.side_effect = Exception("Unexpected error")
 
-        result = _run_single_hook("broken", "/workspace")
+        result = asyncio.run(_run_single_hook("broken", "/workspace"))
 
         assert result.success is False
         assert "failed" in result.output.lower()
 
-    @patch("dispatcher.hooks.subprocess.run")
-    def test_hook_runs_in_correct_directory(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+    @patch("dispatcher.hooks.start_shell", new_callable=AsyncMock)
+    def test_hook_runs_in_correct_directory(self, mock_spawn, fake_process):
+        mock_spawn.return_value = fake_process()
 
-        _run_single_hook("pwd", "/my/workspace")
+        asyncio.run(_run_single_hook("pwd", "/my/workspace"))
 
-        mock_run.assert_called_once()
-        call_kwargs = mock_run.call_args[1]
+        mock_spawn.assert_called_once()
+        call_kwargs = mock_spawn.call_args[1]
         assert call_kwargs["cwd"] == "/my/workspace"
 
-    @patch("dispatcher.hooks.subprocess.run")
-    def test_hook_runs_with_shell(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+    @patch("dispatcher.hooks.start_shell", new_callable=AsyncMock)
+    def test_hook_runs_with_shell(self, mock_spawn, fake_process):
+        mock_spawn.return_value = fake_process()
+
+        asyncio.run(_run_single_hook("echo $HOME && ls", "/workspace"))
 
-        _run_single_hook("echo $HOME && ls", "/workspace")
+        assert mock_spawn.call_args[0] == ("echo $HOME && ls",)
 
-        call_kwargs = mock_run.call_args[1]
-        assert call_kwargs["shell"] is True
+    def test_hook_runs_real_shell_command(self, tmp_path):
+        result = asyncio.run(_run_single_hook("echo out; echo err >&2; exit 3", str(tmp_path)))
+
+        assert result.success is False
+        assert result.output == "out\nerr\n"
 
 
 class TestRunPrePushHooks:
@@ -78,7 +83,7 @@ class TestRunPrePushHooks:
 
     @patch("dispatcher.hooks.PRE_PUSH_HOOKS", [])
     def test_no_hooks_configured(self):
-        success, output = run_pre_push_hooks("/workspace")
+        success, output = asyncio.run(run_pre_push_hooks("/workspace"))
         assert success is True
         assert output == ""
 
@@ -91,7 +96,7 @@ class TestRunPrePushHooks:
             hook_cmd="echo hook1",
         )
 
-        success, output = run_pre_push_hooks("/workspace")
+        success, output = asyncio.run(run_pre_push_hooks("/workspace"))
 
         assert success is True
         assert "hook1 output" in output
@@ -104,12 +109,13 @@ class TestRunPrePushHooks:
             HookResult(success=True, output="hook2 ok", hook_cmd="echo hook2"),
         ]
 
-        success, output = run_pre_push_hooks("/workspace")
+        success, output = asyncio.run(run_pre_push_hooks("/workspace"))
 
         assert success is True
         assert "hook1 ok" in output
         assert "hook2 ok" in output
 
+    @patch("dispatcher.hooks.PRE_PUSH_HOOK_CONCURRENCY", 1)
     @patch("dispatcher.hooks.PRE_PUSH_HOOKS", ["echo hook1", "false", "echo hook3"])
     @patch("dispatcher.hooks._run_single_hook")
     def test_stops_on_first_failure(self, mock_run):
@@ -119,7 +125,7 @@ class TestRunPrePushHooks:
             HookResult(success=True, output="hook3 ok", hook_cmd="echo hook3"),
         ]
 
-        success, output = run_pre_push_hooks("/workspace")
+        success, output = asyncio.run(run_pre_push_hooks("/workspace"))
 
         assert success is False
         assert "hook1 ok" in output
@@ -138,7 +144,91 @@ class TestRunPrePushHooks:
             hook_cmd="secret-scanner",
         )
 
-        success, output = run_pre_push_hooks("/workspace")
+        success, output = asyncio.run(run_pre_push_hooks("/workspace"))
 
         assert success is False
         assert "Found secrets" in output
+
+    @patch("dispatcher.hooks.PRE_PUSH_HOOK_CONCURRENCY", 2)
+    @patch("dispatcher.hooks.PRE_PUSH_HOOKS", ["sleep 0.2; echo first", "echo second"])
+    def test_output_follows_configured_order(self, tmp_path):
+        success, output = asyncio.run(run_pre_push_hooks(str(tmp_path)))
+
+        assert success is True
+        assert output == "first\n\nsecond\n"
+
+    @patch("dispatcher.hooks.PRE_PUSH_HOOK_CONCURRENCY", 2)
+    @patch("dispatcher.hooks.PRE_PUSH_HOOKS", ["sleep 30; echo slow", "echo bad; exit 1"])
+    def test_failure_stops_hooks_still_running(self, tmp_path):
+        started = time.monotonic()
+        success, output = asyncio.run(run_pre_push_hooks(str(tmp_path)))
+
+        assert success is False
+        assert output == "bad\n"
+        assert time.monotonic() - started < 10
+
+
+class TestHookBatcher:
+    """Tests for coalescing pre-push hook runs."""
+
+    @patch("dispatcher.hooks.run_pre_push_hooks")
+    def test_concurrent_pushes_share_one_hook_run(self, mock_hooks):
+        mock_hooks.return_value = (True, "scan ok")
+        batcher = HookBatcher(window_seconds=0.01)
+
+        async def push_three_times():
+            return await asyncio.gather(*(batcher.submit("/workspaces/a") for _ in range(3)))
+
+        results = asyncio.run(push_three_times())
+
+        assert results == [(True, "scan ok")] * 3
+        mock_hooks.assert_called_once_with("/workspaces/a")
+
+    @patch("dispatcher.hooks.run_pre_push_hooks")
+    def test_push_after_batch_started_gets_its_own_run(self, mock_hooks):
+        mock_hooks.return_value = (True, "")
+        batcher = HookBatcher(window_seconds=0)
+
+        async def push_twice_in_sequence():
+            await batcher.submit("/workspaces/a")
+            await batcher.submit("/workspaces/a")
+
+        asyncio.run(push_twice_in_sequence())
+
+        assert mock_hooks.call_count == 2
+
+    @patch("dispatcher.hooks.run_pre_push_hooks")
+    def test_workspaces_are_batched_separately(self, mock_hooks):
+        mock_hooks.side_effect = lambda cwd: (cwd.endswith("a"), cwd)
+        batcher = HookBatcher(window_seconds=0.01)
+
+        async def push_two_workspaces():
+            return await asyncio.gather(
+                batcher.submit("/workspaces/a"),
+                batcher.submit("/workspaces/b"),
+            )
+
+        results = asyncio.run(push_two_workspaces())
+
+        assert results == [(True, "/workspaces/a"), (False, "/workspaces/b")]
+
+
+class TestHookConcurrencySetting:
+    """Tests for reading PRE_PUSH_HOOK_CONCURRENCY."""
+
+    @pytest.fixture
+    def reload_config(self, monkeypatch):
+        """Re-read the configuration, restoring it afterwards."""
+        from dispatcher import config
+        yield lambda: importlib.reload(config)
+        monkeypatch.undo()
+        importlib.reload(config)
+
+    def test_hooks_run_one_at_a_time_by_default(self, reload_config, monkeypatch):
+        monkeypatch.delenv("PRE_PUSH_HOOK_CONCURRENCY", raising=False)
+        assert reload_config().PRE_PUSH_HOOK_CONCURRENCY == 1
+
+    @pytest.mark.parametrize("value", ["0", "-3"])
+    def test_values_below_one_count_as_one(self, reload_config, monkeypatch, value):
+        monkeypatch.setenv("PRE_PUSH_HOOK_CONCURRENCY", value)
+        assert reload_config().PRE_PUSH_HOOK_CONCURRENCY == 1
@@ -0,0 +1,75 @@
+"""Tests for the shared repository mirror."""
+
+import subprocess
+
+import pytest
+
+from dispatcher import mirror
+
+
+@pytest.fixture
+def upstream(tmp_path, monkeypatch):
+    """A local repository standing in for the remote, with mirroring enabled."""
+    source = tmp_path / "upstream"
+    source.mkdir()
+    for args in (
+        ["init", "-q", "-b", "main"],
+        ["-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "init"],
+    ):
+        subprocess.run(["git", *args], cwd=source, check=True, capture_output=True)
+
+    workspaces = tmp_path / "workspaces"
+    workspaces.mkdir()
+    monkeypatch.setattr(mirror, "CLONE_MIRROR", True)
+    monkeypatch.setattr(mirror, "REPO_URL", str(source))
+    monkeypatch.setattr(mirror, "WORKSPACE_ROOT", str(workspaces))
+    monkeypatch.setattr(mirror, "MIRROR_PATH", workspaces / ".mirror")
+    monkeypatch.setattr(mirror, "_LOCK_PATH", workspaces / ".mirror.lock")
+    monkeypatch.setattr(mirror, "_refreshed_at", None)
+    return source
+
+
+class TestReferenceMirror:
+    """Tests for reference_mirror."""
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.setattr(mirror, "CLONE_MIRROR", False)
+        assert mirror.reference_mirror() is None
+
+    def test_creates_bare_mirror(self, upstream):
+        path = mirror.reference_mirror()
+        assert path == str(mirror.MIRROR_PATH)
+        is_bare = subprocess.run(
+            ["git", "rev-parse", "--is-bare-repository"],
+            cwd=path, capture_output=True, text=True,
+        )
+        assert is_bare.stdout.strip() == "true"
+
+    def test_mirror_fetches_branches_only(self, upstream, monkeypatch):
+        """Pull request refs are left out, on creation and on refresh."""
+        def refs(path):
+            return subprocess.run(
+                ["git", "for-each-ref", "--format=%(refname)"],
+                cwd=path, capture_output=True, text=True,
+            ).stdout.split()
+
+        subprocess.run(["git", "update-ref", "refs/pull/1/head", "HEAD"], cwd=upstream, check=True)
+        path = mirror.reference_mirror()
+        assert refs(path) == ["refs/heads/main"]
+
+        subprocess.run(["git", "branch", "feature"], cwd=upstream, check=True)
+        subprocess.run(["git", "update-ref", "refs/pull/2/head", "HEAD"], cwd=upstream, check=True)
+        monkeypatch.setattr(mirror, "_refreshed_at", None)
+        mirror.reference_mirror()
+        assert refs(path) == ["refs/heads/feature", "refs/heads/main"]
+
+    def test_refresh_is_skipped_within_interval(self, upstream, monkeypatch):
+        mirror.reference_mirror()
+        monkeypatch.setattr(mirror, "_refresh_mirror", lambda: pytest.fail("refreshed too soon"))
+        assert mirror.reference_mirror() == str(mirror.MIRROR_PATH)
+
+    def test_failed_clone_falls_back_to_no_mirror(self, upstream, monkeypatch, tmp_path):
+        monkeypatch.setattr(mirror, "REPO_URL", str(tmp_path / "missing"))
+        assert mirror.reference_mirror() is None
+        assert mirror._refreshed_at is None
+        assert list(mirror.MIRROR_PATH.parent.iterdir()) == [mirror._LOCK_PATH]
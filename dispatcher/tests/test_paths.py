@@ -0,0 +1,33 @@
+"""Tests for agent-to-dispatcher path translation."""
+
+import pytest
+
+from dispatcher.config import WORKSPACE_ROOT
+from dispatcher.paths import InvalidPathError, translate_cwd
+
+
+class TestTranslateCwd:
+    """Tests for mapping agent paths onto branch workspaces."""
+
+    def test_workspace_root_maps_to_branch_workspace(self):
+        assert translate_cwd("/home/dev/workspace", "feature") == f"{WORKSPACE_ROOT}/feature"
+
+    def test_subdirectory_maps_into_branch_workspace(self):
+        assert translate_cwd("/home/dev/workspace/src/app", "feature") == (
+            f"{WORKSPACE_ROOT}/feature/src/app"
+        )
+
+    def test_trailing_slash_is_normalized(self):
+        assert translate_cwd("/home/dev/workspace/src/", "feature") == f"{WORKSPACE_ROOT}/feature/src"
+
+    def test_traversal_out_of_workspace_rejected(self):
+        with pytest.raises(InvalidPathError):
+            translate_cwd("/home/dev/workspace/../other", "feature")
+
+    def test_sibling_with_shared_prefix_rejected(self):
+        with pytest.raises(InvalidPathError):
+            translate_cwd("/home/dev/workspace-evil", "feature")
+
+    def test_path_outside_workspace_rejected(self):
+        with pytest.raises(InvalidPathError):
+            translate_cwd("/etc", "feature")
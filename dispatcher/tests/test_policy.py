@@ -1,5 +1,7 @@
 """Tests for branch enforcement policy."""
 
+import subprocess
+
 import pytest
 from unittest.mock import patch
 
@@ -28,6 +30,9 @@ class TestGetCheckoutTarget:
     def test_switch_with_create_flag(self):
         assert get_checkout_target(["switch", "-c", "new-branch"]) == "new-branch"
 
+    def test_branch_named_like_a_subcommand(self):
+        assert get_checkout_target(["checkout", "-b", "switch"]) == "switch"
+
     def test_checkout_with_path_prefix(self):
         # Note: Current implementation doesn't handle -C /path prefix
         # This is a known limitation; the git shim doesn't use these flags.
@@ -173,6 +178,20 @@ class TestCheckPushAllowed:
         result = check_push_allowed(["push"], "/workspace", "feature")
         assert result is None
 
+    def test_planted_head_in_subdirectory_cannot_spoof_branch(self, tmp_path):
+        """Git pushes the real repository's branch, so that is what is checked."""
+        for args in (
+            ["init", "-q", "-b", "main"],
+            ["-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "init"],
+        ):
+            subprocess.run(["git", *args], cwd=tmp_path, check=True)
+        planted = tmp_path / "x" / ".git"
+        planted.mkdir(parents=True)
+        (planted / "HEAD").write_text("ref: refs/heads/feature\n")
+        result = check_push_allowed(["push", "origin"], str(tmp_path / "x"), "feature")
+        assert result is not None
+        assert "can only push from your assigned branch" in result
+
 
 class TestHasUrlTarget:
     """Tests for URL detection in push commands."""
@@ -0,0 +1,30 @@
+"""Tests for starting and stopping child process groups."""
+
+import asyncio
+
+from dispatcher.processes import kill_process_group, start_process
+
+
+class TestKillProcessGroup:
+    """Tests for kill_process_group."""
+
+    def test_kills_children_too(self):
+        async def start_and_kill():
+            process = await start_process(
+                "sh", "-c", "sleep 30 & wait", stdout=asyncio.subprocess.PIPE
+            )
+            await asyncio.sleep(0.1)
+            await kill_process_group(process)
+            # The pipe only closes once the backgrounded sleep has exited too.
+            return await asyncio.wait_for(process.stdout.read(), timeout=5)
+
+        assert asyncio.run(start_and_kill()) == b""
+
+    def test_process_already_gone(self):
+        async def run_then_kill():
+            process = await start_process("true")
+            await process.wait()
+            await kill_process_group(process)
+            return process
+
+        assert asyncio.run(run_then_kill()).returncode == 0
@@ -0,0 +1,84 @@
+"""Tests for the pod registry."""
+
+import pytest
+
+from dispatcher import registry
+from dispatcher.registry import AlreadyRegisteredError
+
+
+@pytest.fixture
+def pod_ip():
+    """A pod IP that is deregistered after the test."""
+    ip = "10.0.0.42"
+    yield ip
+    registry.deregister(ip)
+
+
+class TestRegistry:
+    """Tests for registering and looking up pods."""
+
+    def test_registered_pod_resolves_to_branch(self, pod_ip):
+        registry.register(pod_ip, "feature")
+        assert registry.get_branch(pod_ip) == "feature"
+
+    def test_unregistered_pod_has_no_branch(self):
+        assert registry.get_branch("10.0.0.99") is None
+
+    def test_reregistration_is_rejected(self, pod_ip):
+        registry.register(pod_ip, "feature")
+        with pytest.raises(AlreadyRegisteredError):
+            registry.register(pod_ip, "main")
+        assert registry.get_branch(pod_ip) == "feature"
+
+    def test_deregister_returns_branch_and_forgets_pod(self, pod_ip):
+        registry.register(pod_ip, "feature")
+        assert registry.deregister(pod_ip) == "feature"
+        assert registry.get_branch(pod_ip) is None
+
+    def test_list_all_is_a_snapshot(self, pod_ip):
+        registry.register(pod_ip, "feature")
+        listed = registry.list_all()
+        registry.deregister(pod_ip)
+        assert listed[pod_ip] == "feature"
+
+    def test_list_all_is_read_only(self, pod_ip):
+        registry.register(pod_ip, "feature")
+        with pytest.raises(TypeError):
+            registry.list_all()[pod_ip] = "other"
+
+    def test_unshared_lookup_skips_database(self, pod_ip, monkeypatch):
+        registry.register(pod_ip, "feature")
+        monkeypatch.setattr(registry, "_connection", None)
+        assert registry.get_branch(pod_ip) == "feature"
+
+
+@pytest.fixture
+def shared_registry(tmp_path, monkeypatch):
+    """A file-backed registry plus a second connection standing in for another worker."""
+    path = str(tmp_path / "registry.sqlite3")
+    monkeypatch.setattr(registry, "_connection", registry._open_database(path))
+    monkeypatch.setattr(registry, "_registry", {})
+    monkeypatch.setattr(registry, "_registry_version", None)
+    monkeypatch.setattr(registry, "shared", True)
+    other_worker = registry._open_database(path)
+    yield other_worker
+    other_worker.close()
+
+
+class TestSharedRegistry:
+    """Tests for registrations made by other dispatcher workers."""
+
+    def test_registration_by_another_worker_is_visible(self, shared_registry):
+        assert registry.get_branch("10.0.0.7") is None
+        shared_registry.execute("INSERT INTO pods (ip, branch) VALUES (?, ?)", ("10.0.0.7", "feature"))
+        assert registry.get_branch("10.0.0.7") == "feature"
+
+    def test_deregistration_by_another_worker_invalidates_mapping(self, shared_registry):
+        registry.register("10.0.0.7", "feature")
+        shared_registry.execute("DELETE FROM pods WHERE ip = ?", ("10.0.0.7",))
+        assert registry.get_branch("10.0.0.7") is None
+
+    def test_reregistration_across_workers_is_rejected(self, shared_registry):
+        shared_registry.execute("INSERT INTO pods (ip, branch) VALUES (?, ?)", ("10.0.0.7", "feature"))
+        with pytest.raises(AlreadyRegisteredError, match="feature"):
+            registry.register("10.0.0.7", "main")
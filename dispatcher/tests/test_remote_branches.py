@@ -0,0 +1,71 @@
+"""Tests for the cached remote branch listing."""
+
+import pytest
+
+from dispatcher import remote_branches
+from dispatcher.models import GitResult
+
+
+@pytest.fixture
+def ls_remote(monkeypatch):
+    """Fake ls-remote that records each call and returns two heads."""
+    calls = []
+
+    def fake_execute_with_auth(args, cwd):
+        calls.append(args)
+        return GitResult(
+            exit_code=0,
+            stdout="abc123\trefs/heads/main\ndef456\trefs/heads/feature/xy\n",
+            stderr="",
+        )
+
+    monkeypatch.setattr(remote_branches, "execute_with_auth", fake_execute_with_auth)
+    monkeypatch.setattr(remote_branches, "_listed_at", None)
+    return calls
+
+
+class TestRemoteBranchExists:
+    """Tests for remote_branch_exists."""
+
+    def test_listed_branch_exists(self, ls_remote):
+        assert remote_branches.remote_branch_exists("feature/xy")
+
+    def test_branch_name_prefix_does_not_match(self, ls_remote):
+        assert not remote_branches.remote_branch_exists("feature/x")
+
+    def test_missing_branch_is_confirmed_with_the_remote(self, monkeypatch):
+        """A branch pushed after the listing is still found, so it isn't recreated."""
+        calls = []
+
+        def fake_execute_with_auth(args, cwd):
+            calls.append(args)
+            if len(calls) == 1:
+                return GitResult(exit_code=0, stdout="abc123\trefs/heads/main\n", stderr="")
+            return GitResult(exit_code=0, stdout="def456\trefs/heads/pushed\n", stderr="")
+
+        monkeypatch.setattr(remote_branches, "execute_with_auth", fake_execute_with_auth)
+        monkeypatch.setattr(remote_branches, "_listed_at", None)
+        assert remote_branches.remote_branch_exists("pushed")
+        assert calls[1][-1] == "refs/heads/pushed"
+        assert "--exit-code" in calls[1]
+
+    def test_listing_is_reused_within_ttl(self, ls_remote):
+        remote_branches.remote_branch_exists("main")
+        remote_branches.remote_branch_exists("feature/xy")
+        assert len(ls_remote) == 1
+
+    def test_invalidate_forces_a_new_listing(self, ls_remote):
+        remote_branches.remote_branch_exists("main")
+        remote_branches.invalidate()
+        remote_branches.remote_branch_exists("main")
+        assert len(ls_remote) == 2
+
+    def test_failed_listing_is_not_cached(self, monkeypatch):
+        monkeypatch.setattr(remote_branches, "_listed_at", None)
+        monkeypatch.setattr(
+            remote_branches,
+            "execute_with_auth",
+            lambda args, cwd: GitResult(exit_code=128, stdout="", stderr="fatal: unreachable"),
+        )
+        assert not remote_branches.remote_branch_exists("main")
+        assert remote_branches._listed_at is None
@@ -0,0 +1,24 @@
+"""Tests for command result responses."""
+
+from dispatcher.responses import command_result, denial, policy_denial
+
+
+class TestResponses:
+    """Tests for the exit code header on responses."""
+
+    def test_denial_reports_exit_code_one(self):
+        assert denial("no\n").headers["X-Yolo-Cage-Exit-Code"] == "1"
+
+    def test_policy_denial_appends_newline(self):
+        response = policy_denial("yolo-cage: no")
+        assert response.body == b"yolo-cage: no\n"
+        assert response.headers["X-Yolo-Cage-Exit-Code"] == "1"
+
+    def test_command_result_reports_exit_code(self):
+        assert command_result(b"", 128).headers["X-Yolo-Cage-Exit-Code"] == "128"
+
+    def test_command_result_reports_negative_exit_code(self):
+        assert command_result(b"", -9).headers["X-Yolo-Cage-Exit-Code"] == "-9"
+
+    def test_command_result_passes_output_bytes_through(self):
+        assert command_result(b"caf\xe9\n", 0).body == b"caf\xe9\n"
@@ -17,28 +17,51 @@ class TestUpdateWorkspace:
         workspace = tmp_path / "test-branch"
         workspace.mkdir()
         (workspace / ".git").mkdir()
+        (workspace / ".git" / "HEAD").write_text("ref: refs/heads/test-branch\n")
+
+        fetch_called = []
 
         def mock_execute_with_auth(args, cwd):
+            fetch_called.append(args)
             return GitResult(0, "", "")
 
         def mock_execute(args, cwd):
-            if args[0] == "rev-parse":
-                return GitResult(0, "test-branch\n", "")
             return GitResult(0, "", "")
 
         with patch("dispatcher.sync.execute_with_auth", mock_execute_with_auth):
-            with patch("dispatcher.sync.execute", mock_execute):
+            with patch("dispatcher.sync.execute", mock_execute), patch("dispatcher.sync.execute_quiet", mock_execute):
                 result = update_workspace(workspace, "test-branch")
 
         assert result["status"] == "success"
         assert result["action"] == "already_on_branch"
         assert result["cloned"] is False
+        assert fetch_called == []
+
+    def test_refresh_fetches_when_already_on_branch(self, tmp_path):
+        """refresh=True fetches even if the workspace is already on the branch."""
+        workspace = tmp_path / "test-branch"
+        workspace.mkdir()
+        (workspace / ".git").mkdir()
+        (workspace / ".git" / "HEAD").write_text("ref: refs/heads/test-branch\n")
+
+        fetch_called = []
+
+        def mock_execute_with_auth(args, cwd):
+            fetch_called.append(args)
+            return GitResult(exit_code=0, stdout="", stderr="")
+
+        with patch("dispatcher.sync.execute_with_auth", mock_execute_with_auth):
+            result = update_workspace(workspace, "test-branch", refresh=True)
+
+        assert result["action"] == "already_on_branch"
+        assert fetch_called == [["fetch", "origin"]]
 
     def test_switch_to_existing_local_branch(self, tmp_path):
         """Switch to a branch that exists locally."""
         workspace = tmp_path / "test-branch"
         workspace.mkdir()
         (workspace / ".git").mkdir()
+        (workspace / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
 
         checkout_called = []
 
@@ -46,17 +69,15 @@ class TestUpdateWorkspace:
             return GitResult(0, "", "")
 
         def mock_execute(args, cwd):
-            if args[0] == "rev-parse":
-                return GitResult(0, "main\n", "")  # On different branch
-            if args[0] == "show-ref":
-                return GitResult(0, "", "")  # Branch exists locally
+            if args[0] == "for-each-ref":
+                return GitResult(0, "refs/heads/test-branch\n", "")  # Branch exists locally
             if args[0] == "checkout":
                 checkout_called.append(args)
                 return GitResult(0, "", "")
             return GitResult(0, "", "")
 
         with patch("dispatcher.sync.execute_with_auth", mock_execute_with_auth):
-            with patch("dispatcher.sync.execute", mock_execute):
+            with patch("dispatcher.sync.execute", mock_execute), patch("dispatcher.sync.execute_quiet", mock_execute):
                 result = update_workspace(workspace, "test-branch")
 
         assert result["status"] == "success"
@@ -69,6 +90,7 @@ class TestUpdateWorkspace:
         workspace = tmp_path / "feature"
         workspace.mkdir()
         (workspace / ".git").mkdir()
+        (workspace / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
 
         checkout_called = []
 
@@ -76,19 +98,15 @@ class TestUpdateWorkspace:
             return GitResult(0, "", "")
 
         def mock_execute(args, cwd):
-            if args[0] == "rev-parse":
-                return GitResult(0, "main\n", "")
-            if args[0] == "show-ref":
-                return GitResult(1, "", "")  # Branch doesn't exist locally
-            if args[0] == "ls-remote":
-                return GitResult(0, "abc123\trefs/heads/feature", "")  # Exists on remote
+            if args[0] == "for-each-ref":
+                return GitResult(0, "refs/remotes/origin/feature\n", "")  # Fetched from remote only
             if args[0] == "checkout":
                 checkout_called.append(args)
                 return GitResult(0, "", "")
             return GitResult(0, "", "")
 
         with patch("dispatcher.sync.execute_with_auth", mock_execute_with_auth):
-            with patch("dispatcher.sync.execute", mock_execute):
+            with patch("dispatcher.sync.execute", mock_execute), patch("dispatcher.sync.execute_quiet", mock_execute):
                 result = update_workspace(workspace, "feature")
 
         assert result["status"] == "success"
@@ -100,6 +118,7 @@ class TestUpdateWorkspace:
         workspace = tmp_path / "new-feature"
         workspace.mkdir()
         (workspace / ".git").mkdir()
+        (workspace / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
 
         checkout_called = []
 
@@ -107,19 +126,15 @@ class TestUpdateWorkspace:
             return GitResult(0, "", "")
 
         def mock_execute(args, cwd):
-            if args[0] == "rev-parse":
-                return GitResult(0, "main\n", "")
-            if args[0] == "show-ref":
-                return GitResult(1, "", "")  # Not local
-            if args[0] == "ls-remote":
-                return GitResult(0, "", "")  # Not remote
+            if args[0] == "for-each-ref":
+                return GitResult(0, "", "")  # Neither local nor remote
             if args[0] == "checkout":
                 checkout_called.append(args)
                 return GitResult(0, "", "")
             return GitResult(0, "", "")
 
         with patch("dispatcher.sync.execute_with_auth", mock_execute_with_auth):
-            with patch("dispatcher.sync.execute", mock_execute):
+            with patch("dispatcher.sync.execute", mock_execute), patch("dispatcher.sync.execute_quiet", mock_execute):
                 result = update_workspace(workspace, "new-feature")
 
         assert result["status"] == "success"
@@ -130,21 +145,20 @@ class TestUpdateWorkspace:
         workspace = tmp_path / "test-branch"
         workspace.mkdir()
         (workspace / ".git").mkdir()
+        (workspace / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
 
         def mock_execute_with_auth(args, cwd):
             return GitResult(0, "", "")
 
         def mock_execute(args, cwd):
-            if args[0] == "rev-parse":
-                return GitResult(0, "main\n", "")
-            if args[0] == "show-ref":
-                return GitResult(0, "", "")  # Branch exists locally
+            if args[0] == "for-each-ref":
+                return GitResult(0, "refs/heads/test-branch\n", "")  # Branch exists locally
             if args[0] == "checkout":
                 return GitResult(1, "", "error: cannot checkout")
             return GitResult(0, "", "")
 
         with patch("dispatcher.sync.execute_with_auth", mock_execute_with_auth):
-            with patch("dispatcher.sync.execute", mock_execute):
+            with patch("dispatcher.sync.execute", mock_execute), patch("dispatcher.sync.execute_quiet", mock_execute):
                 with pytest.raises(SyncError) as exc:
                     update_workspace(workspace, "test-branch")
                 assert "Failed to checkout" in str(exc.value)